@@ -168,6 +168,32 @@ def fix_ibor_mccy_cashflow(cashflow: qcf.IborMultiCurrencyCashflow, market_data:
     cashflow.set_fx_rate_index_value(fx_rate_index_value)
 
 
+class CachedIndexValues:
+    """
+    Envuelve un `qcv.MarketData` y memoiza `get_index_value` por fecha e índice. Sirve para hacer el fixing
+    de muchos flujos, que en general comparten fechas e índices, consultando cada valor una sola vez.
+    El resto de los atributos se leen directamente del `qcv.MarketData` original.
+
+    Args:
+        market_data (qcv.MarketData): Objeto con la data de mercado necesaria para hacer el fixing
+    """
+    def __init__(self, market_data: qcv.MarketData):
+        self._market_data = market_data
+        self._index_values = {}
+
+    def get_index_value(self, fecha, index_name: str) -> float:
+        key = (fecha, index_name)
+        try:
+            return self._index_values[key]
+        except KeyError:
+            value = self._market_data.get_index_value(fecha, index_name)
+            self._index_values[key] = value
+            return value
+
+    def __getattr__(self, name):
+        return getattr(self._market_data, name)
+
+
 def fix_cashflow(cashflow: qcf.Cashflow, market_data: qcv.MarketData):
     """
     Realiza el fixing de tasa de interés y tipo de cambio cuando corresponde de cualquier tipo de qcf.Cashflow.
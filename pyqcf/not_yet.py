@@ -1,8 +1,25 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
 from urllib3.exceptions import InsecureRequestWarning
 from urllib3 import disable_warnings
 disable_warnings(InsecureRequestWarning)
 
 
+def _ensure_qcdate(process_date: Union[date, qcf.QCDate]) -> qcf.QCDate:
+    """
+    Retorna `process_date` como `qcf.QCDate`. Las conversiones desde `date` construyen un `qcf.QCDate` nuevo,
+    ya que es mutable y no se debe compartir entre llamadas.
+    """
+    if isinstance(process_date, date):
+        return qcf.QCDate(process_date.day, process_date.month, process_date.year)
+    return process_date
+
+
 class GetFixingForLeg(BaseModel):
     """
     Realiza el fixing del cupón corriente de cualquier tipo de pata.
@@ -433,8 +450,7 @@ class GetM2MForLeg(BaseModel):
             TypeOfLeg.SOFRRATE: self.get_m2m_overnight_index_leg,
         }
 
-        if isinstance(process_date, date):
-            process_date = qcf.build_qcdate_from_string(process_date.isoformat())
+        process_date = _ensure_qcdate(process_date)
 
         return switcher[leg.type_of_leg](process_date, leg)
 
@@ -720,12 +736,23 @@ class GetPresentValueForLeg(BaseModel):
             TypeOfLeg.SOFRRATE: self.get_m2m_overnight_index_leg,
         }
 
-        if isinstance(process_date, date):
-            process_date = qcf.build_qcdate_from_string(process_date.isoformat())
+        process_date = _ensure_qcdate(process_date)
 
         return switcher[leg.type_of_leg](process_date, leg)
 
 
+# Columnas de cada fila de flujos regulatorios, en el orden en que las retorna `GetRegulatoryCashflowForLeg`.
+REGULATORY_CASHFLOW_COLUMNS = [
+    "deal_number",
+    "a_p",
+    "type_of_leg",
+    "currency",
+    "end_date",
+    "interest",
+    "nominal",
+]
+
+
 class GetRegulatoryCashflowForLeg(BaseModel):
     """
     Calcula los flujos regulatorios de cualquier tipo de pata.
@@ -733,11 +760,26 @@ class GetRegulatoryCashflowForLeg(BaseModel):
 
     get_fixing: GetFixingForLeg
     sd: Union[StaticData, MarketData]
+    _fx_cache: Dict[Tuple[qcw.Currency, date], float] = PrivateAttr(default_factory=dict)
 
     class Config:
         arbitrary_types_allowed = True
         allow_mutation = False
 
+    def _to_clp(self, amount: float, currency: qcw.Currency, py_date: date) -> float:
+        """
+        Convierte `amount` a CLP. El factor de conversión se calcula una sola vez por par (moneda, fecha).
+        """
+        if currency is qcw.Currency.CLP:
+            return amount
+
+        key = (currency, py_date)
+        fx = self._fx_cache.get(key)
+        if fx is None:
+            fx = amount_to_clp(1.0, currency, py_date, self.sd)
+            self._fx_cache[key] = fx
+        return amount * fx
+
     @staticmethod
     def __zero_cashflow(process_date: qcf.QCDate, leg: OperationLeg):
         return [
@@ -797,11 +839,10 @@ class GetRegulatoryCashflowForLeg(BaseModel):
                 leg.type_of_leg.value,
                 leg.nominal_currency.value,
                 leg.qcf_leg.get_cashflow_at(i).get_end_date().description(False),
-                amount_to_clp(
+                self._to_clp(
                     leg.qcf_leg.get_cashflow_at(i).interest(),
                     leg.nominal_currency,
                     py_date,
-                    self.sd,
                 ),
                 0.0,
             )
@@ -818,20 +859,18 @@ class GetRegulatoryCashflowForLeg(BaseModel):
                 leg.type_of_leg.value,
                 leg.nominal_currency.value,
                 py_date_1.isoformat(),
-                amount_to_clp(
+                self._to_clp(
                     cashflow.accrued_interest(
                         process_date,
                         self.sd.historic_index_values[overnight_index_code][1],
                     ),
                     leg.nominal_currency,
                     py_date,
-                    self.sd,
                 ),
-                amount_to_clp(
+                self._to_clp(
                     cashflow.get_nominal(),
                     leg.nominal_currency,
                     py_date,
-                    self.sd,
                 ),
             ),
         )
@@ -857,17 +896,15 @@ class GetRegulatoryCashflowForLeg(BaseModel):
                 leg.type_of_leg.value,
                 leg.nominal_currency.value,
                 qcf_leg.get_cashflow_at(i).get_settlement_date().description(False),
-                amount_to_clp(
+                self._to_clp(
                     qcf_leg.get_cashflow_at(i).interest(),
                     leg.nominal_currency,
                     py_date,
-                    self.sd,
                 ),
-                amount_to_clp(
+                self._to_clp(
                     qcf_leg.get_cashflow_at(i).amortization(),
                     leg.nominal_currency,
                     py_date,
-                    self.sd,
                 ),
             )
             for i in range(index, leg.qcf_leg.size())
@@ -892,11 +929,10 @@ class GetRegulatoryCashflowForLeg(BaseModel):
                 leg.nominal_currency.value,
                 cashflow.date().description(False),
                 0.0,
-                amount_to_clp(
+                self._to_clp(
                     cashflow.amount(),
                     leg.nominal_currency,
                     py_date,
-                    self.sd,
                 ),
             )
         ]
@@ -932,17 +968,15 @@ class GetRegulatoryCashflowForLeg(BaseModel):
                 leg.type_of_leg.value,
                 leg.nominal_currency.value,
                 process_date.description(False),
-                amount_to_clp(
+                self._to_clp(
                     cashflow.accrued_interest(process_date, icp, uf),
                     leg.nominal_currency,
                     py_date,
-                    self.sd,
                 ),
-                amount_to_clp(
+                self._to_clp(
                     cashflow.get_nominal(),
                     leg.nominal_currency,
                     py_date,
-                    self.sd,
                 ),
             )
         ]
@@ -966,44 +1000,48 @@ class GetRegulatoryCashflowForLeg(BaseModel):
             return GetRegulatoryCashflowForLeg.__zero_cashflow(process_date, leg)
 
         py_date = qcf_date_to_py_date(process_date)
-        result = [
+        deal_number = leg.deal_number
+        a_p = leg.a_p.value
+        type_of_leg = leg.type_of_leg.value
+        currency = leg.nominal_currency.value
+
+        # La primera posición queda reservada para el flujo corriente, que se calcula después de fijar la pata.
+        result = [None]
+        get_cashflow_at = leg.qcf_leg.get_cashflow_at
+        result.extend(
             (
-                leg.deal_number,
-                leg.a_p.value,
-                leg.type_of_leg.value,
-                leg.nominal_currency.value,
-                leg.qcf_leg.get_cashflow_at(i).get_end_date().description(False),
-                leg.qcf_leg.get_cashflow_at(i).interest(),
+                deal_number,
+                a_p,
+                type_of_leg,
+                currency,
+                cf.get_end_date().description(False),
+                cf.interest(),
                 0.0,
             )
-            for i in range(indice + 1, leg.qcf_leg.size())
-        ]
+            for cf in (get_cashflow_at(i) for i in range(indice + 1, leg.qcf_leg.size()))
+        )
 
         code = cashflow.get_interest_rate_index().get_code()
         code = config.interest_rate_index_aliases.get(code, code)
+        fixing_value = self.sd.historic_index_values[code][1]
 
         self.get_fixing.fix_ibor_leg(process_date, leg.qcf_leg)
         current_cashflow = leg.get_current_cashflow(process_date)
-        result.insert(
-            0,
-            (
-                leg.deal_number,
-                leg.a_p.value,
-                leg.type_of_leg.value,
-                leg.nominal_currency.value,
-                current_cashflow.get_end_date().description(False),
-                amount_to_clp(
-                    cashflow.interest(self.sd.historic_index_values[code][1]),
-                    leg.nominal_currency,
-                    py_date,
-                    self.sd,
-                ),
-                amount_to_clp(
-                    cashflow.get_nominal(),
-                    leg.nominal_currency,
-                    py_date,
-                    self.sd,
-                ),
+        result[0] = (
+            deal_number,
+            a_p,
+            type_of_leg,
+            currency,
+            current_cashflow.get_end_date().description(False),
+            self._to_clp(
+                cashflow.interest(fixing_value),
+                leg.nominal_currency,
+                py_date,
+            ),
+            self._to_clp(
+                cashflow.get_nominal(),
+                leg.nominal_currency,
+                py_date,
             ),
         )
 
@@ -1018,72 +1056,114 @@ class GetRegulatoryCashflowForLeg(BaseModel):
             return GetRegulatoryCashflowForLeg.__zero_cashflow(process_date, leg)
 
         py_date = qcf_date_to_py_date(process_date)
-        result = [
+        deal_number = leg.deal_number
+        a_p = leg.a_p.value
+        type_of_leg = leg.type_of_leg.value
+        currency = leg.nominal_currency.value
+
+        # La primera posición queda reservada para el flujo corriente, que se calcula después de fijar la pata.
+        result = [None]
+        get_cashflow_at = leg.qcf_leg.get_cashflow_at
+        result.extend(
             (
-                leg.deal_number,
-                leg.a_p.value,
-                leg.type_of_leg.value,
-                leg.nominal_currency.value,
-                leg.qcf_leg.get_cashflow_at(i).get_end_date().description(False),
-                leg.qcf_leg.get_cashflow_at(i).interest(),
+                deal_number,
+                a_p,
+                type_of_leg,
+                currency,
+                cf.get_end_date().description(False),
+                cf.interest(),
                 0.0,
             )
-            for i in range(indice + 1, leg.qcf_leg.size())
-        ]
+            for cf in (get_cashflow_at(i) for i in range(indice + 1, leg.qcf_leg.size()))
+        )
 
         code = "SOFRRATE"
         code = config.interest_rate_index_aliases.get(code, code)
+        fixing_value = self.sd.historic_index_values[code][1]
 
         self.get_fixing.fix_compounded_overnight_rate_leg(process_date, leg.qcf_leg)
 
         current_cashflow = leg.get_current_cashflow(process_date)
-        result.insert(
-            0,
-            (
-                leg.deal_number,
-                leg.a_p.value,
-                leg.type_of_leg.value,
-                leg.nominal_currency.value,
-                current_cashflow.get_end_date().description(False),
-                amount_to_clp(
-                    cashflow.accrued_interest(
-                        process_date, self.sd.historic_index_values[code][1]
-                    ),
-                    leg.nominal_currency,
-                    py_date,
-                    self.sd,
-                ),
-                amount_to_clp(
-                    cashflow.get_nominal(),
-                    leg.nominal_currency,
-                    py_date,
-                    self.sd,
-                ),
+        result[0] = (
+            deal_number,
+            a_p,
+            type_of_leg,
+            currency,
+            current_cashflow.get_end_date().description(False),
+            self._to_clp(
+                cashflow.accrued_interest(process_date, fixing_value),
+                leg.nominal_currency,
+                py_date,
+            ),
+            self._to_clp(
+                cashflow.get_nominal(),
+                leg.nominal_currency,
+                py_date,
             ),
         )
 
         return result
 
+    # Tabla de despacho por tipo de pata, construida una sola vez al definir la clase.
+    _DISPATCH: ClassVar[Dict[TypeOfLeg, Callable]] = {
+        TypeOfLeg.FXFWD: case_fwd_leg,
+        TypeOfLeg.FIXED_RATE: case_fixed_leg,
+        TypeOfLeg.ICPCLP: partial(__generic_overnight_index, overnight_index_code="ICPCLP"),
+        TypeOfLeg.ICPCLF: case_icp_clf_leg,
+        TypeOfLeg.FLOATING_RATE: case_ibor_leg,
+        TypeOfLeg.SOFRINDX: partial(__generic_overnight_index, overnight_index_code="SOFRINDX"),
+        TypeOfLeg.SOFRRATE: case_sofrrate_leg,
+    }
+
     def __call__(self, process_date: Union[qcf.QCDate, date], leg: OperationLeg):
-        if isinstance(process_date, date):
-            process_date = qcf.build_qcdate_from_string(process_date.isoformat())
+        self._fx_cache.clear()
+        process_date = _ensure_qcdate(process_date)
 
-        switcher = {
-            TypeOfLeg.FXFWD: self.case_fwd_leg,
-            TypeOfLeg.FIXED_RATE: self.case_fixed_leg,
-            TypeOfLeg.ICPCLP: self.case_icp_clp_leg,
-            TypeOfLeg.ICPCLF: self.case_icp_clf_leg,
-            TypeOfLeg.FLOATING_RATE: self.case_ibor_leg,
-            TypeOfLeg.SOFRINDX: self.case_sofrindx_leg,
-            TypeOfLeg.SOFRRATE: self.case_sofrrate_leg,
-        }
+        return self._DISPATCH[leg.type_of_leg](self, process_date, leg)
 
-        return switcher[leg.type_of_leg](process_date, leg)
+    @staticmethod
+    def as_dataframe(rows: List[Tuple]) -> pd.DataFrame:
+        """
+        Arma un `pd.DataFrame` con los flujos regulatorios en `rows`.
+
+        Las filas se trasponen en columnas una sola vez y los montos se guardan directamente como
+        arreglos `np.float64`, sin pasar por la inferencia de tipos fila a fila de pandas.
+
+        Parameters
+        ----------
+        rows: List[Tuple]
+            Filas como las que retorna `self(process_date, leg)`.
+
+        Returns
+        -------
+        Un `pd.DataFrame` con columnas `REGULATORY_CASHFLOW_COLUMNS`.
+        """
+        if not rows:
+            return pd.DataFrame(columns=REGULATORY_CASHFLOW_COLUMNS)
+
+        columns = list(zip(*rows))
+        data = {name: list(values) for name, values in zip(REGULATORY_CASHFLOW_COLUMNS[:5], columns[:5])}
+        data["interest"] = np.fromiter(columns[5], dtype=np.float64, count=len(rows))
+        data["nominal"] = np.fromiter(columns[6], dtype=np.float64, count=len(rows))
+        return pd.DataFrame(data, columns=REGULATORY_CASHFLOW_COLUMNS)
+
+
+def _weighted_sum(values: List[float], factors: List[float]) -> float:
+    """
+    Retorna la suma de `values` ponderados por `factors`, calculada en numpy como un producto punto.
+    """
+    if not values:
+        return 0.0
+    return float(np.dot(np.asarray(values, dtype=np.float64), np.asarray(factors, dtype=np.float64)))
 
 
-class Config:
-    arbitrary_types_allowed = True
-    allow_mutation = False
+# Índice usado para reajustar a CLP el capital de cada moneda.
+_INDICE_FX = {
+    qcw.Currency.CLP: "1CLP",
+    qcw.Currency.CLF: "UF",
+    qcw.Currency.USD: "USDCLP_RC",
+    qcw.Currency.EUR: "EURCLP_RC",
+}
 
 
 Estado = namedtuple(
@@ -1104,7 +1184,7 @@ Estado = namedtuple(
 )
 
 
-@dataclass(config=Config)
+@dataclass(slots=True)
 class CalculaEstado:
     """
     Métodos para el cálculo del estado (en el sentido de ALM) de una pata de una operación.
@@ -1121,84 +1201,200 @@ class CalculaEstado:
 
     sd: StaticData
     get_mtm: GetM2MForLeg
+    _fx_cache: Dict[Tuple[qcw.Currency, date], float] = field(init=False, repr=False, default_factory=dict)
+    _initial_fx_cache: Dict[Tuple[date, str], float] = field(init=False, repr=False, default_factory=dict)
+    icpclp: qcf.time_series = field(init=False, repr=False)
+    sofrindx: qcf.time_series = field(init=False, repr=False)
+    _icpclp_map: Dict[str, float] = field(init=False, repr=False)
+    _sofrindx_map: Dict[str, float] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # `StaticData` ya trae cada índice como `qcf.time_series` junto al DataFrame, se reutiliza
+        # en vez de reconstruirlo fecha a fecha en cada instancia.
+        self.icpclp = self.sd.historic_index_values["ICPCLP"][1]
+        self.sofrindx = self.sd.historic_index_values["SOFRINDX"][1]
+
+        # Copias en dict de Python (fecha ISO -> valor) para el fixing de los cupones en __call__.
+        self._icpclp_map = self.__index_map("ICPCLP")
+        self._sofrindx_map = self.__index_map("SOFRINDX")
+
+    def __index_map(self, index_code: str) -> Dict[str, float]:
+        data = self.sd.historic_index_values[index_code][0]
+        return dict(zip(data.index.to_list(), data["value"].to_list()))
+
+    def _to_clp(self, amount: float, currency: qcw.Currency, py_date: date) -> float:
+        """
+        Convierte `amount` a CLP. El factor de conversión se calcula una sola vez por par (moneda, fecha).
+        """
+        if currency is qcw.Currency.CLP:
+            return amount
+
+        key = (currency, py_date)
+        fx = self._fx_cache.get(key)
+        if fx is None:
+            fx = amount_to_clp(1.0, currency, py_date, self.sd)
+            self._fx_cache[key] = fx
+        return amount * fx
+
+    def __index_data(self, leg: OperationLeg) -> qcf.time_series:
+        if leg.type_of_leg == TypeOfLeg.ICPCLP:
+            return self.icpclp
+        else:
+            return self.sofrindx
 
-    def __post_init_post_parse__(self):
-        self.icpclp = qcf.time_series()
-        data = self.sd.historic_index_values["ICPCLP"][0]
-        for t in data.itertuples():
-            self.icpclp[qcf.build_qcdate_from_string(t.Index)] = t.value
-
-        self.sofrindx = qcf.time_series()
-        data = self.sd.historic_index_values["SOFRINDX"][0]
-        for t in data.itertuples():
-            self.sofrindx[qcf.build_qcdate_from_string(t.Index)] = t.value
+    def _zero_amount(self, process_date: qcf.QCDate, leg: OperationLeg, current: Any) -> float:
+        return 0.0
 
-    def __capital_vigente(self, process_date: qcf.QCDate, leg: OperationLeg) -> float:
-        """ """
-        if isinstance(process_date, date):
-            process_date = qcf.build_qcdate_from_string(process_date.isoformat())
+    def _capital_vigente_other(self, process_date: qcf.QCDate, leg: OperationLeg, current: Any) -> float:
+        start_date = leg.get_min_start_date()
+        end_date = leg.get_max_end_date()
 
-        def simple_cashflow():
+        if process_date < start_date:
+            return leg.qcf_leg.get_cashflow_at(0).get_nominal()
+        elif start_date <= process_date < end_date:
+            return current.get_nominal()
+        else:
             return 0
 
-        def other_cashflow():
-            start_date = leg.get_min_start_date()
-            end_date = leg.get_max_end_date()
-
-            if process_date < start_date:
-                return leg.qcf_leg.get_cashflow_at(0).get_nominal()
-            elif start_date <= process_date < end_date:
-                return leg.get_current_cashflow(process_date).get_nominal()
-            else:
-                return 0
-
-        switcher = {
-            TypeOfLeg.FXFWD: simple_cashflow,
-        }
-
-        amount = switcher.get(leg.type_of_leg, other_cashflow)()
-        return amount_to_clp(
+    def __capital_vigente(self, process_date: qcf.QCDate, leg: OperationLeg, current: Any) -> float:
+        """ """
+        amount = self._CAPITAL_VIGENTE_DISPATCH.get(leg.type_of_leg, CalculaEstado._capital_vigente_other)(
+            self, process_date, leg, current
+        )
+        return self._to_clp(
             amount,
             leg.nominal_currency,
             qcf_date_to_py_date(process_date),
-            self.sd,
         )
 
-    def __reajuste_fx(self, process_date: qcf.QCDate, leg: OperationLeg) -> float:
-        if leg.type_of_leg == TypeOfLeg.FXFWD:
-            return 0.0
-
-        que_indice = {
-            qcw.Currency.CLP: "1CLP",
-            qcw.Currency.CLF: "UF",
-            qcw.Currency.USD: "USDCLP_RC",
-            qcw.Currency.EUR: "EURCLP_RC",
-        }
-
-        capital_vigente = self.__capital_vigente(process_date, leg)
-        if leg.get_min_start_date() > process_date:
-            return 0.0
-        fecha_inicio = qcf_date_to_py_date(leg.get_min_start_date())
-        moneda = leg.nominal_currency
+    def __initial_fx(self, fecha_inicio: date, index_code: str) -> float:
+        """
+        Retorna el valor de `index_code` a `fecha_inicio`. Si el valor no está en `self.sd` se busca en
+        Front Desk. El resultado se guarda para que cada par (fecha, índice) se busque una sola vez.
+        """
+        key = (fecha_inicio, index_code)
+        if key in self._initial_fx_cache:
+            return self._initial_fx_cache[key]
 
-        fx_inicial = self.sd.get_index_value(
-            fecha_inicio,
-            que_indice[moneda],
-        )
+        fx_inicial = self.sd.get_index_value(fecha_inicio, index_code)
 
         if fx_inicial == 0.0:
             data = dfd.get_fx_rate_index_values(
                 fecha_inicio,
                 fecha_inicio,
-                que_indice[moneda],
+                index_code,
             )
             if len(data) > 0:
                 fx_inicial = data.iloc[0].value
 
         if fx_inicial == 0.0:
-            msg = f"El índice {que_indice[moneda]} tiene valor 0 al {fecha_inicio}."
+            msg = f"El índice {index_code} tiene valor 0 al {fecha_inicio}."
             raise ValueError(msg)
 
+        self._initial_fx_cache[key] = fx_inicial
+        return fx_inicial
+
+    @staticmethod
+    def __read_cashflows(leg: OperationLeg) -> List[Any]:
+        """
+        Lee una sola vez todos los flujos de `leg` desde el objeto de C++.
+        """
+        qcf_leg = leg.qcf_leg
+        get_cashflow_at = qcf_leg.get_cashflow_at
+        return [get_cashflow_at(i) for i in range(qcf_leg.size())]
+
+    @staticmethod
+    def __locate(process_date: qcf.QCDate, cashflows: List[Any]) -> Tuple[List[qcf.QCDate], int]:
+        """
+        Retorna las fechas finales de `cashflows` y la cantidad `k` de flujos cuya fecha final es menor o
+        igual a `process_date`. Si la pata está vigente, `cashflows[k]` es el flujo corriente.
+
+        `k` se ubica con una búsqueda binaria sobre las fechas finales, que son crecientes.
+        """
+        end_dates = [cashflow.get_end_date() for cashflow in cashflows]
+        return end_dates, bisect_right(end_dates, process_date)
+
+    def __fx_factors(self, leg: OperationLeg, due: List[Tuple[Any, qcf.QCDate]]) -> List[float]:
+        """
+        Factores de conversión a CLP de la moneda de `leg` a la fecha final de cada flujo en `due`.
+        """
+        currency = leg.nominal_currency
+        return [self._to_clp(1.0, currency, qcf_date_to_py_date(end_date)) for _, end_date in due]
+
+    def __fix_icp_values(self, process_date: qcf.QCDate, leg: OperationLeg, cashflows: List[Any]):
+        """
+        Fija los valores ICP (o SOFRINDX) de inicio y final de los cupones de `leg` ya iniciados.
+        """
+        comp_index_legs = {
+            TypeOfLeg.ICPCLP: self._icpclp_map,
+            TypeOfLeg.SOFRINDX: self._sofrindx_map,
+        }
+        index_map = comp_index_legs.get(leg.type_of_leg)
+        if index_map is None:
+            return
+
+        def get_value(fecha: str) -> float:
+            try:
+                return index_map[fecha]
+            except KeyError:
+                msg = f"No hay valor del índice {leg.type_of_leg.name} al {fecha} (operación {leg.deal_number})."
+                raise ValueError(msg) from None
+
+        start_dates = [cashflow.get_start_date() for cashflow in cashflows]
+        for cashflow, start_date in zip(cashflows[:bisect_right(start_dates, process_date)], start_dates):
+            cashflow.set_start_date_icp(get_value(start_date.description(False)))
+            end_date = cashflow.get_end_date()
+            if process_date >= end_date:
+                cashflow.set_end_date_icp(get_value(end_date.description(False)))
+
+    def _zero_paid(
+            self, process_date: qcf.QCDate, leg: OperationLeg, due: List[Tuple[Any, qcf.QCDate]]
+    ) -> Tuple[float, float]:
+        return 0.0, 0.0
+
+    def _paid_fixed(
+            self, process_date: qcf.QCDate, leg: OperationLeg, due: List[Tuple[Any, qcf.QCDate]]
+    ) -> Tuple[float, float]:
+        """
+        Retorna el interés y la amortización pagados, en CLP, de una pata de tasa fija.
+        """
+        interest = []
+        amortization = []
+        for cashflow, _ in due:
+            interest.append(cashflow.interest())
+            amortization.append(cashflow.get_amortization())
+
+        fx_factors = self.__fx_factors(leg, due)
+        return _weighted_sum(interest, fx_factors), _weighted_sum(amortization, fx_factors)
+
+    def _paid_icp(
+            self, process_date: qcf.QCDate, leg: OperationLeg, due: List[Tuple[Any, qcf.QCDate]]
+    ) -> Tuple[float, float]:
+        """
+        Retorna el interés pagado, en CLP, y la amortización pagada de una pata ICPCLP o SOFRINDX.
+        """
+        index_data = self.__index_data(leg)
+        interest = []
+        amortization = 0.0
+        for cashflow, end_date in due:
+            interest.append(cashflow.accrued_interest(end_date, index_data))
+            amortization += cashflow.get_amortization()
+
+        return _weighted_sum(interest, self.__fx_factors(leg, due)), amortization
+
+    def __reajuste_fx(self, process_date: qcf.QCDate, leg: OperationLeg, capital_vigente: float) -> float:
+        if leg.type_of_leg == TypeOfLeg.FXFWD:
+            return 0.0
+
+        que_indice = _INDICE_FX
+
+        if leg.get_min_start_date() > process_date:
+            return 0.0
+        fecha_inicio = qcf_date_to_py_date(leg.get_min_start_date())
+        moneda = leg.nominal_currency
+
+        fx_inicial = self.__initial_fx(fecha_inicio, que_indice[moneda])
+
         fx_proceso = self.sd.get_index_value(
             qcf_date_to_py_date(process_date),
             que_indice[moneda],
@@ -1210,216 +1406,95 @@ class CalculaEstado:
             msg = f"El índice {que_indice[moneda]} tiene valor 0 al {process_date.description(False)}."
             raise ValueError(msg)
 
-    def __interes_devengado(self, process_date: qcf.QCDate, leg: OperationLeg) -> float:
-        """ """
+    def _interes_devengado_fixed(self, process_date: qcf.QCDate, leg: OperationLeg, current: Any) -> float:
+        start_date = leg.get_min_start_date()
+        end_date = leg.get_max_end_date()
 
-        def simple_cashflow() -> float:
+        if process_date < start_date:
             return 0.0
+        elif start_date <= process_date < end_date:
+            return current.accrued_interest(
+                process_date
+            )
+        else:
+            return 0
 
-        def fixed_rate_cashflow():
-            start_date = leg.get_min_start_date()
-            end_date = leg.get_max_end_date()
-
-            if process_date < start_date:
-                return 0.0
-            elif start_date <= process_date < end_date:
-                return leg.get_current_cashflow(process_date).accrued_interest(
-                    process_date
-                )
-            else:
-                return 0
-
-        def icpclp_cashflow() -> float:
-            if leg.type_of_leg == TypeOfLeg.ICPCLP:
-                index_data = self.icpclp
-            else:
-                index_data = self.sofrindx
-
-            start_date = leg.get_min_start_date()
-            end_date = leg.get_max_end_date()
-
-            if process_date < start_date:
-                return 0.0
+    def _interes_devengado_icp(self, process_date: qcf.QCDate, leg: OperationLeg, current: Any) -> float:
+        start_date = leg.get_min_start_date()
+        end_date = leg.get_max_end_date()
 
-            elif start_date <= process_date < end_date:
-                return leg.get_current_cashflow(process_date).accrued_interest(
-                    process_date,
-                    index_data,
-                )
+        if process_date < start_date:
+            return 0.0
 
-            else:
-                return 0.0
+        elif start_date <= process_date < end_date:
+            return current.accrued_interest(
+                process_date,
+                self.__index_data(leg),
+            )
 
-        switcher = {
-            TypeOfLeg.FXFWD: simple_cashflow,
-            TypeOfLeg.FIXED_RATE: fixed_rate_cashflow,
-            TypeOfLeg.ICPCLP: icpclp_cashflow,
-            TypeOfLeg.SOFRINDX: icpclp_cashflow,
-        }
+        else:
+            return 0.0
 
-        amount = switcher.get(leg.type_of_leg, simple_cashflow)()
-        return amount_to_clp(
+    def __interes_devengado(self, process_date: qcf.QCDate, leg: OperationLeg, current: Any) -> float:
+        """ """
+        amount = self._INTERES_DEVENGADO_DISPATCH.get(leg.type_of_leg, CalculaEstado._zero_amount)(
+            self, process_date, leg, current
+        )
+        return self._to_clp(
             amount,
             leg.nominal_currency,
             qcf_date_to_py_date(process_date),
-            self.sd,
         )
 
-    def __interes_pagado(self, process_date: qcf.QCDate, leg: OperationLeg) -> float:
-        def simple_cashflow() -> float:
-            return 0.0
-
-        def fixed_rate_cashflow():
-            start_date = leg.get_min_start_date()
-            end_date = leg.get_max_end_date()
-            total = 0.0
-
-            if process_date <= start_date:
-                return total
-            else:
-                for i in range(leg.qcf_leg.size()):
-                    cashflow = leg.qcf_leg.get_cashflow_at(i)
-                    cashflow_end_date = cashflow.get_end_date()
-                    if process_date >= cashflow_end_date:
-                        total += amount_to_clp(
-                            cashflow.interest(),
-                            leg.nominal_currency,
-                            qcf_date_to_py_date(cashflow_end_date),
-                            self.sd,
-                        )
-                    else:
-                        return total
-
-            return total
-
-        def icpclp_cashflow():
-            if leg.type_of_leg == TypeOfLeg.ICPCLP:
-                index_data = self.icpclp
-            else:
-                index_data = self.sofrindx
-
-            start_date = leg.get_min_start_date()
-            end_date = leg.get_max_end_date()
-            total = 0.0
-
-            if process_date <= start_date:
-                return total
-            else:
-                for i in range(leg.qcf_leg.size()):
-                    cashflow = leg.qcf_leg.get_cashflow_at(i)
-                    cashflow_end_date = cashflow.get_end_date()
-                    if process_date >= cashflow_end_date:
-                        total += amount_to_clp(
-                            cashflow.accrued_interest(cashflow_end_date, index_data),
-                            leg.nominal_currency,
-                            qcf_date_to_py_date(cashflow_end_date),
-                            self.sd,
-                        )
-                    else:
-                        return total
-
-            return total
-
-        switcher = {
-            TypeOfLeg.FXFWD: simple_cashflow,
-            TypeOfLeg.FIXED_RATE: fixed_rate_cashflow,
-            TypeOfLeg.ICPCLP: icpclp_cashflow,
-            TypeOfLeg.SOFRINDX: icpclp_cashflow,
-        }
-
-        return switcher.get(leg.type_of_leg, simple_cashflow)()
-
-    def __capital_pagado(self, process_date: qcf.QCDate, leg: OperationLeg) -> float:
-        if isinstance(process_date, date):
-            process_date = qcf.build_qcdate_from_string(process_date.isoformat())
-
-        def simple_cashflow() -> float:
-            return 0.0
+    def __valor_mercado(self, process_date: qcf.QCDate, leg: OperationLeg) -> float:
+        """ """
+        return self.get_mtm(process_date, leg)
 
-        def fixed_rate_cashflow():
-            start_date = leg.get_min_start_date()
-            end_date = leg.get_max_end_date()
-            total = 0.0
-
-            if process_date <= start_date:
-                return total
-            else:
-                for i in range(leg.qcf_leg.size()):
-                    cashflow = leg.qcf_leg.get_cashflow_at(i)
-                    cashflow_end_date = cashflow.get_end_date()
-                    if process_date >= cashflow_end_date:
-                        total += amount_to_clp(
-                            cashflow.get_amortization(),
-                            leg.nominal_currency,
-                            qcf_date_to_py_date(cashflow_end_date),
-                            self.sd,
-                        )
-                    else:
-                        return total
-
-            return total
-
-        def icpclp_cashflow():
-            if leg.type_of_leg == TypeOfLeg.ICPCLP:
-                index = "ICPCLP"
-            else:
-                index = "SOFRINDX"
-
-            start_date = leg.get_min_start_date()
-            end_date = leg.get_max_end_date()
-            total = 0.0
-
-            if process_date <= start_date:
-                return total
-            else:
-                for i in range(leg.qcf_leg.size()):
-                    cashflow = leg.qcf_leg.get_cashflow_at(i)
-                    cashflow_end_date = cashflow.get_end_date()
-                    if process_date >= cashflow_end_date:
-                        total += cashflow.get_amortization()
-                    else:
-                        return total
-            return total
+    # Tablas de despacho por tipo de pata, construidas una sola vez al definir la clase.
+    _CAPITAL_VIGENTE_DISPATCH: ClassVar[Dict[TypeOfLeg, Callable]] = {
+        TypeOfLeg.FXFWD: _zero_amount,
+    }
+    _INTERES_DEVENGADO_DISPATCH: ClassVar[Dict[TypeOfLeg, Callable]] = {
+        TypeOfLeg.FXFWD: _zero_amount,
+        TypeOfLeg.FIXED_RATE: _interes_devengado_fixed,
+        TypeOfLeg.ICPCLP: _interes_devengado_icp,
+        TypeOfLeg.SOFRINDX: _interes_devengado_icp,
+    }
+    _PAID_DISPATCH: ClassVar[Dict[TypeOfLeg, Callable]] = {
+        TypeOfLeg.FXFWD: _zero_paid,
+        TypeOfLeg.FIXED_RATE: _paid_fixed,
+        TypeOfLeg.ICPCLP: _paid_icp,
+        TypeOfLeg.SOFRINDX: _paid_icp,
+    }
+
+    def _compute_all(self, process_date: qcf.QCDate, leg: OperationLeg) -> Estado:
+        """
+        Calcula todos los indicadores de `Estado` leyendo los flujos de `leg` una sola vez.
 
-        switcher = {
-            TypeOfLeg.FXFWD: simple_cashflow,
-            TypeOfLeg.FIXED_RATE: fixed_rate_cashflow,
-            TypeOfLeg.ICPCLP: icpclp_cashflow,
-            TypeOfLeg.SOFRINDX: icpclp_cashflow,
-        }
+        El capital vigente se calcula una vez y se reutiliza en el reajuste FX, y el interés y la amortización
+        pagados se acumulan en una misma pasada sobre los flujos vencidos.
+        """
+        cashflows = self.__read_cashflows(leg)
+        self.__fix_icp_values(process_date, leg, cashflows)
 
-        return switcher.get(leg.type_of_leg, simple_cashflow)()
+        end_dates, k = self.__locate(process_date, cashflows)
+        current = cashflows[k] if k < len(cashflows) else None
 
-    def __valor_mercado(self, process_date: qcf.QCDate, leg: OperationLeg) -> float:
-        """ """
-        return self.get_mtm(process_date, leg)
+        capital_vigente = self.__capital_vigente(process_date, leg, current)
+        reajuste_fx = self.__reajuste_fx(process_date, leg, capital_vigente)
+        interes_devengado = self.__interes_devengado(process_date, leg, current)
 
-    def __call__(
-            self, process_date: Union[date, qcf.QCDate], leg: OperationLeg
-    ) -> Estado:
-        if isinstance(process_date, date):
-            process_date = qcf.build_qcdate_from_string(process_date.isoformat())
+        if process_date <= leg.get_min_start_date():
+            interes_pagado, capital_pagado = 0.0, 0.0
+        else:
+            accumulate = self._PAID_DISPATCH.get(leg.type_of_leg, CalculaEstado._zero_paid)
+            interes_pagado, capital_pagado = accumulate(
+                self,
+                process_date,
+                leg,
+                list(zip(cashflows[:k], end_dates[:k])),
+            )
 
-        comp_index_legs = {
-            TypeOfLeg.ICPCLP: self.icpclp,
-            TypeOfLeg.SOFRINDX: self.sofrindx,
-        }
-        if leg.type_of_leg in comp_index_legs.keys():
-            index_data = comp_index_legs[leg.type_of_leg]
-            for i in range(leg.qcf_leg.size()):
-                cashflow = leg.qcf_leg.get_cashflow_at(i)
-                if process_date >= cashflow.get_start_date():
-                    cashflow.set_start_date_icp(index_data[cashflow.get_start_date()])
-                    if process_date >= cashflow.get_end_date():
-                        cashflow.set_end_date_icp(index_data[cashflow.get_end_date()])
-                else:
-                    break
-
-        capital_vigente = self.__capital_vigente(process_date, leg)
-        reajuste_fx = self.__reajuste_fx(process_date, leg)
-        interes_devengado = self.__interes_devengado(process_date, leg)
-        interes_pagado = self.__interes_pagado(process_date, leg)
-        capital_pagado = self.__capital_pagado(process_date, leg)
         saldo = capital_vigente + interes_devengado
         valor_mercado = self.__valor_mercado(process_date, leg)
         ajuste_valor_mercado = valor_mercado - saldo
@@ -1438,3 +1513,11 @@ class CalculaEstado:
             ajuste_valor_mercado,
             flujos_pagados,
         )
+
+    def __call__(
+            self, process_date: Union[date, qcf.QCDate], leg: OperationLeg
+    ) -> Estado:
+        self._fx_cache.clear()
+        process_date = _ensure_qcdate(process_date)
+
+        return self._compute_all(process_date, leg)
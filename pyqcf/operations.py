@@ -4,24 +4,38 @@ from pydantic import (
     model_validator,
     Field,
     ConfigDict,
-    field_serializer,
     PositiveInt,
+    PrivateAttr,
+    Discriminator,
+    Tag,
 )
 
 from strenum import StrEnum
-from itertools import cycle
 from typing import (
+    Annotated,
     Union,
     Any,
+    Callable,
+    ClassVar,
+    Literal,
 )
-from enum import auto
-import re
+from enum import Enum, auto
+from dataclasses import dataclass, is_dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from operator import methodcaller
 
 import qcfinancial as qcf
 
 from . import wrappers as qcw
 from . import config
 
+# Factores del módulo 11 para el dígito verificador del RUT, aplicados desde el dígito de las unidades.
+_RUT_FACTORS = (2, 3, 4, 5, 6, 7)
+
+# Caracteres válidos para el dígito verificador.
+_DV_CHARS = frozenset("0123456789K")
+
 
 class Rut(BaseModel):
     rut: int = Field(ge=0)
@@ -30,17 +44,22 @@ class Rut(BaseModel):
     @field_validator('dv')
     @classmethod
     def validate_dv(cls, value: str) -> str:
-        if not re.match(r'^[0-9K]$', value):
+        if len(value) != 1 or value not in _DV_CHARS:
             raise ValueError('Field can only contain a single character: a digit 0-9 or the character "K"')
         return value
 
     @model_validator(mode='after')
     def digito_verificador(self):
-        reversed_digits = map(int, reversed(str(self.rut)))
-        factors = cycle(range(2, 8))
-        s = sum(d * f for d, f in zip(reversed_digits, factors))
-        check = (-s) % 11 if (-s) % 11 < 10 else 'K'
-        if str(check) != self.dv:
+        n = self.rut
+        s = 0
+        i = 0
+        while n:
+            n, d = divmod(n, 10)
+            s += d * _RUT_FACTORS[i % 6]
+            i += 1
+        r = (-s) % 11
+        check = 'K' if r == 10 else str(r)
+        if check != self.dv:
             raise ValueError('The data entered is not a valid Chilean RUT.')
         return self
 
@@ -51,24 +70,57 @@ class Rut(BaseModel):
         return f"{self.rut}-{self.dv}"
 
 
-class InitialNotional(BaseModel):
+@dataclass(slots=True, frozen=True)
+class InitialNotional:
+    """
+    Nocional inicial de una pata con amortización bullet. Pydantic valida la dataclass cuando
+    se recibe como diccionario dentro de un Leg Generator.
+    """
     initial_notional: float
 
+    def __post_init__(self):
+        # Pydantic no vuelve a validar instancias ya construidas, se asegura aquí que el valor sea float.
+        object.__setattr__(self, "initial_notional", float(self.initial_notional))
+
 
 class CustomNotionalAmort(BaseModel):
     custom_notional_amort: list[tuple[float, float]]
 
     def as_qcf(self) -> qcf.CustomNotionalAmort:
-        cna = qcf.CustomNotionalAmort(len(self.custom_notional_amort))
-        for i in range(len(self.custom_notional_amort)):
-            cna.set_notional_amort_at(
-                i,
-                self.custom_notional_amort[i][0],
-                self.custom_notional_amort[i][1],
-            )
+        # qcfinancial no expone un constructor que reciba la tabla completa, se carga fila a fila.
+        notional_amort = self.custom_notional_amort
+        cna = qcf.CustomNotionalAmort(len(notional_amort))
+        set_notional_amort_at = cna.set_notional_amort_at
+        for i, (notional, amort) in enumerate(notional_amort):
+            set_notional_amort_at(i, notional, amort)
         return cna
 
 
+def _notional_or_custom_tag(value: Any) -> str | None:
+    """
+    Retorna el tag de `NotionalOrCustom` que corresponde a `value`, sin intentar validar cada alternativa.
+    """
+    if isinstance(value, InitialNotional):
+        return "bullet"
+    if isinstance(value, CustomNotionalAmort):
+        return "custom"
+    if isinstance(value, dict):
+        if "initial_notional" in value:
+            return "bullet"
+        if "custom_notional_amort" in value:
+            return "custom"
+    return None
+
+
+NotionalOrCustom = Annotated[
+    Union[
+        Annotated[InitialNotional, Tag("bullet")],
+        Annotated[CustomNotionalAmort, Tag("custom")],
+    ],
+    Discriminator(_notional_or_custom_tag),
+]
+
+
 class TypeOfAmortization(StrEnum):
     """
     Representa los tipos de amortización en Front Desk.
@@ -78,6 +130,10 @@ class TypeOfAmortization(StrEnum):
     CUSTOM = auto()
 
 
+# Los miembros de un enum son únicos, por lo que se pueden comparar con `is`.
+_BULLET = TypeOfAmortization.BULLET
+
+
 class Product(StrEnum):
     """
     Representa los tres tipos de producto swap disponibles en Front Desk.
@@ -124,14 +180,45 @@ class MultiCurrencyModel(BaseModel):
 
 # ----------- Leg Generators -----------------------------------------------
 
-class FixedRateLegGenerator(BaseModel):
+# Serialización de los campos de un Leg Generator que no se entregan tal cual en `custom_dump`.
+# Reproduce lo que hace `model_dump(mode="python")` para esos tipos.
+_GENERATOR_FIELD_DUMP: dict[type, Callable[[Any], Any]] = {
+    qcw.Fecha: lambda fecha: fecha.fecha,
+    qcw.Tenor: lambda tenor: {"agnos": tenor.agnos, "meses": tenor.meses, "dias": tenor.dias},
+}
+
+
+class _AmortDumpMixin:
+    """
+    Implementa `custom_dump` para los Leg Generators, que guardan el nocional o la amortización
+    customizada en el campo `notional_or_custom`.
+    """
+
+    def custom_dump(self, type_of_amortization: TypeOfAmortization):
+        # Se leen los campos directamente en vez de usar `model_dump`, que recorre recursivamente todo el modelo.
+        result = {}
+        for name in type(self).model_fields:
+            value = getattr(self, name)
+            dump = _GENERATOR_FIELD_DUMP.get(type(value))
+            result[name] = value if dump is None else dump(value)
+        notional_or_custom = result.pop("notional_or_custom")
+        if type_of_amortization is _BULLET:
+            result["initial_notional"] = notional_or_custom.initial_notional
+        else:
+            result["custom_notional_amort"] = notional_or_custom.custom_notional_amort
+        return result
+
+
+class FixedRateLegGenerator(_AmortDumpMixin, BaseModel):
     """
     Almacena los parámetros necesarios para dar de alta una pata con flujos de tipo
     `qcfinancial.FixedRateCashflow`.
     """
+    model_config = ConfigDict(frozen=True, extra="forbid", arbitrary_types_allowed=True)
+
     rp: qcw.AP
-    start_date: qcw.Fecha
-    end_date: qcw.Fecha
+    start_date: qcw.FechaSer
+    end_date: qcw.FechaSer
     maturity: qcw.Tenor
     bus_adj_rule: qcw.BusAdjRules
     periodicity: qcw.Tenor
@@ -139,33 +226,23 @@ class FixedRateLegGenerator(BaseModel):
     settlement_calendar: str
     settlement_lag: int = Field(ge=0)
     type_of_amortization: TypeOfAmortization
-    notional_or_custom: InitialNotional | CustomNotionalAmort
+    notional_or_custom: NotionalOrCustom
     amort_is_cashflow: bool = True
     coupon_rate_value: float
     coupon_rate_type: qcw.TypeOfRate
     notional_currency: qcw.Currency
     is_bond: bool = False
 
-    @field_serializer('start_date', 'end_date')
-    def serialize_date(self, dt: qcw.Fecha):
-        return dt.fecha
-
-    def custom_dump(self, type_of_amortization: TypeOfAmortization):
-        result = self.model_dump()
-        if type_of_amortization == TypeOfAmortization.BULLET:
-            result["initial_notional"] = result.pop("notional_or_custom")["initial_notional"]
-        else:
-            result["custom_notional_amort"] = result.pop("notional_or_custom")["custom_notional_amort"]
-        return result
-
 
-class IborLegGenerator(BaseModel):
+class IborLegGenerator(_AmortDumpMixin, BaseModel):
     """
     Almacena los datos necesarios para construir una pata de tipo Ibor.
     """
+    model_config = ConfigDict(frozen=True, extra="forbid", arbitrary_types_allowed=True)
+
     rp: qcw.AP
-    start_date: qcw.Fecha
-    end_date: qcw.Fecha
+    start_date: qcw.FechaSer
+    end_date: qcw.FechaSer
     maturity: qcw.Tenor
     bus_adj_rule: qcw.BusAdjRules
     settlement_periodicity: qcw.Tenor
@@ -178,34 +255,24 @@ class IborLegGenerator(BaseModel):
     fixing_calendar: str
     fixing_lag: int = Field(ge=0)
     interest_rate_index_name: str
-    notional_or_custom: InitialNotional | CustomNotionalAmort
+    notional_or_custom: NotionalOrCustom
     amort_is_cashflow: bool
     notional_currency: qcw.Currency
     spread: float
     gearing: float
 
-    @field_serializer('start_date', 'end_date')
-    def serialize_date(self, dt: qcw.Fecha):
-        return dt.fecha
-
     @field_validator('interest_rate_index_name')
     @classmethod
     def replace_spaces(cls, value: str) -> str:
         return value.replace(" ", "-")
 
-    def custom_dump(self, type_of_amortization: TypeOfAmortization):
-        result = self.model_dump()
-        if type_of_amortization == TypeOfAmortization.BULLET:
-            result["initial_notional"] = result.pop("notional_or_custom")["initial_notional"]
-        else:
-            result["custom_notional_amort"] = result.pop("notional_or_custom")["custom_notional_amort"]
-        return result
 
+class OvernightIndexLegGenerator(_AmortDumpMixin, BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", arbitrary_types_allowed=True)
 
-class OvernightIndexLegGenerator(BaseModel):
     rp: qcw.AP
-    start_date: qcw.Fecha
-    end_date: qcw.Fecha
+    start_date: qcw.FechaSer
+    end_date: qcw.FechaSer
     maturity: qcw.Tenor  # NO al constructor de cqf
     bus_adj_rule: qcw.BusAdjRules
     fix_adj_rule: qcw.BusAdjRules
@@ -218,29 +285,19 @@ class OvernightIndexLegGenerator(BaseModel):
     overnight_index_name: str
     interest_rate: qcw.TypeOfRate
     eq_rate_decimal_places: PositiveInt
-    notional_or_custom: InitialNotional | CustomNotionalAmort
+    notional_or_custom: NotionalOrCustom
     amort_is_cashflow: bool
     notional_currency: qcw.Currency
     spread: float
     gearing: float
 
-    @field_serializer('start_date', 'end_date')
-    def serialize_date(self, dt: qcw.Fecha):
-        return dt.fecha
-
-    def custom_dump(self, type_of_amortization: TypeOfAmortization):
-        result = self.model_dump()
-        if type_of_amortization == TypeOfAmortization.BULLET:
-            result["initial_notional"] = result.pop("notional_or_custom")["initial_notional"]
-        else:
-            result["custom_notional_amort"] = result.pop("notional_or_custom")["custom_notional_amort"]
-        return result
 
+class IcpClfLegGenerator(_AmortDumpMixin, BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", arbitrary_types_allowed=True)
 
-class IcpClfLegGenerator(BaseModel):
     rp: qcw.AP
-    start_date: qcw.Fecha
-    end_date: qcw.Fecha
+    start_date: qcw.FechaSer
+    end_date: qcw.FechaSer
     maturity: qcw.Tenor  # NO al constructor de cqf
     bus_adj_rule: qcw.BusAdjRules
     settlement_periodicity: qcw.Tenor
@@ -249,28 +306,18 @@ class IcpClfLegGenerator(BaseModel):
     settlement_lag: int = Field(ge=0)
     type_of_amortization: TypeOfAmortization  # NO al constructor de cqf
     overnight_index_name: str  # NO al constructor de cqf
-    notional_or_custom: InitialNotional | CustomNotionalAmort
+    notional_or_custom: NotionalOrCustom
     amort_is_cashflow: bool
     spread: float
     gearing: float
 
-    @field_serializer('start_date', 'end_date')
-    def serialize_date(self, dt: qcw.Fecha):
-        return dt.fecha
-
-    def custom_dump(self, type_of_amortization: TypeOfAmortization):
-        result = self.model_dump()
-        if type_of_amortization == TypeOfAmortization.BULLET:
-            result["initial_notional"] = result.pop("notional_or_custom")["initial_notional"]
-        else:
-            result["custom_notional_amort"] = result.pop("notional_or_custom")["custom_notional_amort"]
-        return result
 
+class CompoundedOvernightRateLegGenerator(_AmortDumpMixin, BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", arbitrary_types_allowed=True)
 
-class CompoundedOvernightRateLegGenerator(BaseModel):
     rp: qcw.AP
-    start_date: qcw.Fecha
-    end_date: qcw.Fecha
+    start_date: qcw.FechaSer
+    end_date: qcw.FechaSer
     maturity: qcw.Tenor
     bus_adj_rule: qcw.BusAdjRules
     settlement_periodicity: qcw.Tenor
@@ -280,7 +327,7 @@ class CompoundedOvernightRateLegGenerator(BaseModel):
     type_of_amortization: TypeOfAmortization
     fixing_calendar: str
     overnight_rate_name: str
-    notional_or_custom: InitialNotional | CustomNotionalAmort
+    notional_or_custom: NotionalOrCustom
     amort_is_cashflow: bool
     notional_currency: qcw.Currency
     spread: float
@@ -290,450 +337,521 @@ class CompoundedOvernightRateLegGenerator(BaseModel):
     lookback: int = Field(ge=0)
     lockout: int = Field(ge=0)
 
-    @field_serializer('start_date', 'end_date')
-    def serialize_date(self, dt: qcw.Fecha):
-        return dt.fecha
+# ------------- End Leg Generators ------------------------------------------
 
-    def custom_dump(self, type_of_amortization: TypeOfAmortization):
-        result = self.model_dump()
-        if type_of_amortization == TypeOfAmortization.BULLET:
-            result["initial_notional"] = result.pop("notional_or_custom")["initial_notional"]
-        else:
-            result["custom_notional_amort"] = result.pop("notional_or_custom")["custom_notional_amort"]
-        return result
 
-# ------------- End Leg Generators ------------------------------------------
+class _ByIdentity:
+    """
+    Envuelve un objeto no hashable (por ejemplo el diccionario de calendarios) para usarlo como llave
+    de caché. Dos llaves son iguales sólo si envuelven el mismo objeto.
+    """
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __hash__(self):
+        return id(self.obj)
+
+    def __eq__(self, other):
+        return isinstance(other, _ByIdentity) and other.obj is self.obj
+
+
+@lru_cache(maxsize=256)
+def _interest_rate_index(name: str, calendars: _ByIdentity) -> qcf.InterestRateIndex:
+    return config.InterestRateIndex(name).as_qcf(calendars=calendars.obj)
+
+
+@lru_cache(maxsize=256)
+def _fx_rate_index(name: str, calendars: _ByIdentity) -> qcf.FXRateIndex:
+    return config.FXRateIndex(name).as_qcf(calendars=calendars.obj)
+
+
+_as_qcf = methodcaller("as_qcf")
+
+# Parámetros cuyo objeto `qcf` es mutable (`QCDate`, `QCInterestRate`): se convierten en cada construcción.
+_PER_BUILD_PARAMETERS = frozenset({"start_date", "end_date", "interest_rate"})
+
+# Esquemas de parámetros de `qcf.LegFactory` que se leen directamente del Leg Generator.
+# Cada entrada es (nombre del parámetro, atributo del Leg Generator, conversión o None).
+_FIXED_RATE_SCHEMA = (
+    ("rec_pay", "rp", _as_qcf),
+    ("start_date", "start_date", _as_qcf),
+    ("end_date", "end_date", _as_qcf),
+    ("bus_adj_rule", "bus_adj_rule", _as_qcf),
+    ("settlement_periodicity", "periodicity", _as_qcf),
+    ("stub_period", "stub_period", _as_qcf),
+    ("settlement_lag", "settlement_lag", None),
+    ("amort_is_cashflow", "amort_is_cashflow", None),
+    ("notional_currency", "notional_currency", _as_qcf),
+)
+
+_IBOR_SCHEMA = (
+    ("rec_pay", "rp", _as_qcf),
+    ("start_date", "start_date", _as_qcf),
+    ("end_date", "end_date", _as_qcf),
+    ("bus_adj_rule", "bus_adj_rule", _as_qcf),
+    ("settlement_periodicity", "settlement_periodicity", _as_qcf),
+    ("stub_period", "settlement_stub_period", _as_qcf),
+    ("settlement_lag", "settlement_lag", None),
+    ("fixing_periodicity", "fixing_periodicity", _as_qcf),
+    ("fixing_stub_period", "fixing_stub_period", _as_qcf),
+    ("fixing_lag", "fixing_lag", None),
+    ("amort_is_cashflow", "amort_is_cashflow", None),
+    ("notional_currency", "notional_currency", _as_qcf),
+    ("spread", "spread", None),
+    ("gearing", "gearing", None),
+)
+
+_OVERNIGHT_INDEX_SCHEMA = (
+    ("rec_pay", "rp", _as_qcf),
+    ("start_date", "start_date", _as_qcf),
+    ("end_date", "end_date", _as_qcf),
+    ("bus_adj_rule", "bus_adj_rule", _as_qcf),
+    ("settlement_periodicity", "settlement_periodicity", _as_qcf),
+    ("stub_period", "settlement_stub_period", _as_qcf),
+    ("settlement_lag", "settlement_lag", None),
+    ("amort_is_cashflow", "amort_is_cashflow", None),
+    ("index_name", "overnight_index_name", None),
+    ("notional_currency", "notional_currency", _as_qcf),
+    ("eq_rate_decimal_places", "eq_rate_decimal_places", None),
+    ("spread", "spread", None),
+    ("gearing", "gearing", None),
+)
+
+_ICP_CLF_SCHEMA = (
+    ("rec_pay", "rp", _as_qcf),
+    ("start_date", "start_date", _as_qcf),
+    ("end_date", "end_date", _as_qcf),
+    ("bus_adj_rule", "bus_adj_rule", _as_qcf),
+    ("settlement_periodicity", "settlement_periodicity", _as_qcf),
+    ("stub_period", "settlement_stub_period", _as_qcf),
+    ("settlement_lag", "settlement_lag", None),
+    ("amort_is_cashflow", "amort_is_cashflow", None),
+    ("spread", "spread", None),
+    ("gearing", "gearing", None),
+)
+
+_COMPOUNDED_OVERNIGHT_RATE_SCHEMA = (
+    ("rec_pay", "rp", _as_qcf),
+    ("start_date", "start_date", _as_qcf),
+    ("end_date", "end_date", _as_qcf),
+    ("bus_adj_rule", "bus_adj_rule", _as_qcf),
+    ("settlement_periodicity", "settlement_periodicity", _as_qcf),
+    ("settlement_stub_period", "settlement_stub_period", _as_qcf),
+    ("settlement_lag", "settlement_lag", None),
+    ("cashflow_is_amort", "amort_is_cashflow", None),
+    ("notional_currency", "notional_currency", _as_qcf),
+    ("spread", "spread", None),
+    ("gearing", "gearing", None),
+    ("interest_rate", "interest_rate_type", _as_qcf),
+    ("eq_rate_decimal_places", "eq_rate_decimal_places", None),
+    ("lookback", "lookback", None),
+    ("lockout", "lockout", None),
+)
 
 
 class LegModel(BaseModel):
     model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
         arbitrary_types_allowed=True,
     )
     type_of_leg: TypeOfLeg
     leg_number: int = Field(ge=0)
+    _dates_calendars: dict[str, qcf.BusinessCalendar] | None = PrivateAttr(default=None)
+    _start_dates: list[qcf.QCDate] = PrivateAttr(default_factory=list)
+    _end_dates: list[qcf.QCDate] = PrivateAttr(default_factory=list)
+    _static_parameters: dict[str, Any] | None = PrivateAttr(default=None)
+
+    # Los siguientes atributos los define cada subclase.
+    # Parámetros que se leen directamente del Leg Generator, ver `_FIXED_RATE_SCHEMA`.
+    _PARAM_SCHEMA: ClassVar[tuple[tuple[str, str, Callable | None], ...]] = ()
+    # Parámetros que son calendarios: (nombre del parámetro, atributo con el nombre del calendario).
+    _CALENDAR_SCHEMA: ClassVar[tuple[tuple[str, str], ...]] = ()
+    # Nombres de los métodos de `qcf.LegFactory` para amortización bullet y customizada.
+    _BULLET_FACTORY: ClassVar[str] = ""
+    _CUSTOM_AMORT_FACTORY: ClassVar[str] = ""
 
     def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
-        # This method is empty because it will be overriden in subclasses.
-        pass
-
-    def get_current_cashflow(self, fecha: qcw.Fecha, all_calendars: dict[str, qcf.BusinessCalendar]):
+        """
+        Retorna la pata como `qcf.Leg`.
+
+        Cada llamada construye una pata nueva: quien la recibe puede modificar sus flujos (por ejemplo, al hacer
+        el fixing) sin afectar a otras llamadas. Sólo se reutilizan los parámetros que no dependen de los
+        calendarios, ver `_static_qcf_parameters`.
+        """
+        qcf_leg = self._build_qcf_leg(all_calendars)
+        if self._dates_calendars is not all_calendars:
+            self._cache_cashflow_dates(qcf_leg, all_calendars)
+        return qcf_leg
+
+    def _cache_cashflow_dates(self, qcf_leg: qcf.Leg, all_calendars: dict[str, qcf.BusinessCalendar]) -> None:
+        # Las fechas de los flujos sólo se leen, nunca se entregan a quien llama.
+        cashflows = qcf_leg.get_cashflows()
+        self._start_dates = [c.get_start_date() for c in cashflows]
+        self._end_dates = [c.get_end_date() for c in cashflows]
+        self._dates_calendars = all_calendars
+
+    def _current_cashflow_index(self, fecha: qcw.Fecha, all_calendars: dict[str, qcf.BusinessCalendar]) -> int:
+        """
+        Posición del flujo que cumple fecha inicio <= `fecha` < fecha final. Las fechas de los flujos se
+        calculan una sola vez por diccionario de calendarios y están ordenadas por fecha de inicio, por lo
+        que el flujo se ubica con una búsqueda binaria. Si no hay un flujo vigente a `fecha` se levanta
+        `IndexError`.
+        """
+        if self._dates_calendars is not all_calendars:
+            self._cache_cashflow_dates(self._build_qcf_leg(all_calendars), all_calendars)
         qcdate = fecha.as_qcf()
-        return [c for c in self.qcf_leg(all_calendars).get_cashflows() if c.get_start_date() <= qcdate < c.get_end_date()][0]
+        i = bisect_right(self._start_dates, qcdate) - 1
+        if i < 0 or not qcdate < self._end_dates[i]:
+            raise IndexError(f"La pata {self.leg_number} no tiene un flujo vigente al {qcdate.iso_code()}.")
+        return i
 
+    def custom_dump(self) -> dict[str, Any]:
+        """
+        Retorna la pata como un diccionario plano con los campos del Leg Generator y, si la pata es
+        multi moneda, los de `MultiCurrencyModel`. Es el formato que lee `Operation.from_trusted_dict`.
+        """
+        leg_gen = self.leg_generator
+        result = {
+            "type_of_leg": self.type_of_leg,
+            "leg_number": self.leg_number,
+            **leg_gen.custom_dump(leg_gen.type_of_amortization),
+        }
+        if "multi_currency" in type(self).model_fields:
+            multi_currency = self.multi_currency
+            result["settlement_currency"] = multi_currency.settlement_currency
+            result["fx_rate_index_name"] = multi_currency.fx_rate_index_name
+            result["fx_fixing_lag"] = multi_currency.fx_fixing_lag
+        return result
 
-class FixedRateLegModel(LegModel):
-    leg_generator: FixedRateLegGenerator
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
+        """
+        Parámetros que no son una lectura directa de un atributo del Leg Generator.
+        """
+        return {}
 
-    def custom_dump(self):
+    def _bullet_parameters(self) -> dict[str, Any]:
+        return {"initial_notional": self.leg_generator.notional_or_custom.initial_notional}
+
+    def _multi_currency_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
         return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(
-                self.leg_generator.type_of_amortization
+            "settlement_currency": self.multi_currency.settlement_currency.as_qcf(),
+            "fx_rate_index": _fx_rate_index(
+                self.multi_currency.fx_rate_index_name, _ByIdentity(all_calendars)
             ),
+            "fx_rate_index_fixing_lag": self.multi_currency.fx_fixing_lag,
         }
 
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
+    def _static_qcf_parameters(self) -> dict[str, Any]:
+        """
+        Parámetros de `_PARAM_SCHEMA` salvo los de `_PER_BUILD_PARAMETERS`. No dependen de los calendarios y
+        el Leg Generator es inmutable, por lo que se calculan una sola vez por pata.
+        """
+        if self._static_parameters is None:
+            leg_gen = self.leg_generator
+            self._static_parameters = {
+                name: getattr(leg_gen, attr) if convert is None else convert(getattr(leg_gen, attr))
+                for name, attr, convert in self._PARAM_SCHEMA
+                if name not in _PER_BUILD_PARAMETERS
+            }
+        return self._static_parameters
+
+    def _build_qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
         leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "settlement_periodicity": leg_gen.periodicity.as_qcf(),
-            "stub_period": leg_gen.stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "amort_is_cashflow": leg_gen.amort_is_cashflow,
-            "interest_rate": leg_gen.coupon_rate_type.as_qcf_with_value(leg_gen.coupon_rate_value),
-            "notional_currency": leg_gen.notional_currency.as_qcf(),
-        }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["is_bond"] = leg_gen.is_bond
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_fixed_rate_leg(**parameters)
+        parameters = dict(self._static_qcf_parameters())
+        for name, attr, convert in self._PARAM_SCHEMA:
+            if name in _PER_BUILD_PARAMETERS:
+                parameters[name] = convert(getattr(leg_gen, attr))
+        for name, attr in self._CALENDAR_SCHEMA:
+            parameters[name] = all_calendars[getattr(leg_gen, attr)]
+        parameters.update(self._extra_parameters(all_calendars))
+
+        if leg_gen.type_of_amortization is _BULLET:
+            parameters.update(self._bullet_parameters())
+            return getattr(qcf.LegFactory, self._BULLET_FACTORY)(**parameters)
         else:
             parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_fixed_rate_leg(**parameters)
+            return getattr(qcf.LegFactory, self._CUSTOM_AMORT_FACTORY)(**parameters)
 
+    def get_current_cashflow(self, fecha: qcw.Fecha, all_calendars: dict[str, qcf.BusinessCalendar]):
+        """
+        Retorna el flujo de la pata que cumple fecha inicio <= `fecha` < fecha final. Si no hay un flujo
+        vigente a `fecha` se levanta `IndexError`.
 
-class FixedRateMultiCurrencyLegModel(LegModel):
+        El flujo pertenece a una pata recién construida, por lo que se puede modificar (por ejemplo, al hacer
+        el fixing) sin afectar a otras llamadas.
+        """
+        qcf_leg = self.qcf_leg(all_calendars)
+        return qcf_leg.get_cashflow_at(self._current_cashflow_index(fecha, all_calendars))
+
+
+class FixedRateLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.FIXED_RATE] = TypeOfLeg.FIXED_RATE
     leg_generator: FixedRateLegGenerator
-    multi_currency: MultiCurrencyModel
 
-    def custom_dump(self) -> dict[str, Any]:
+    _PARAM_SCHEMA = _FIXED_RATE_SCHEMA
+    _CALENDAR_SCHEMA = (("settlement_calendar", "settlement_calendar"),)
+    _BULLET_FACTORY = "build_bullet_fixed_rate_leg"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_fixed_rate_leg"
+
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
+        leg_gen = self.leg_generator
         return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(
-                self.leg_generator.type_of_amortization,
-            ),
-            **self.multi_currency.model_dump()
+            "interest_rate": leg_gen.coupon_rate_type.as_qcf_with_value(leg_gen.coupon_rate_value),
         }
 
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
+    def _bullet_parameters(self) -> dict[str, Any]:
+        return {
+            "is_bond": self.leg_generator.is_bond,
+            "initial_notional": self.leg_generator.notional_or_custom.initial_notional,
+        }
+
+
+class FixedRateMultiCurrencyLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.FIXED_RATE_MCCY] = TypeOfLeg.FIXED_RATE_MCCY
+    leg_generator: FixedRateLegGenerator
+    multi_currency: MultiCurrencyModel
+
+    _PARAM_SCHEMA = _FIXED_RATE_SCHEMA + (("is_bond", "is_bond", None),)
+    _CALENDAR_SCHEMA = (("settlement_calendar", "settlement_calendar"),)
+    _BULLET_FACTORY = "build_bullet_fixed_rate_mccy_leg"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_fixed_rate_mccy_leg"
+
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
         leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "settlement_periodicity": leg_gen.periodicity.as_qcf(),
-            "stub_period": leg_gen.stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "amort_is_cashflow": leg_gen.amort_is_cashflow,
+        return {
             "interest_rate": leg_gen.coupon_rate_type.as_qcf_with_value(leg_gen.coupon_rate_value),
-            "notional_currency": leg_gen.notional_currency.as_qcf(),
-            "is_bond": leg_gen.is_bond,
-            "settlement_currency": self.multi_currency.settlement_currency.as_qcf(),
-            "fx_rate_index": config.FXRateIndex(
-                self.multi_currency.fx_rate_index_name
-            ).as_qcf(calendars=all_calendars),
-            "fx_rate_index_fixing_lag": self.multi_currency.fx_fixing_lag,
+            **self._multi_currency_parameters(all_calendars),
         }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_fixed_rate_mccy_leg(**parameters)
-        else:
-            parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_fixed_rate_mccy_leg(**parameters)
 
 
 class IborLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.IBOR] = TypeOfLeg.IBOR
     leg_generator: IborLegGenerator
 
-    def custom_dump(self) -> dict[str, Any]:
-        return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(
-                self.leg_generator.type_of_amortization,
-            ),
-        }
+    _PARAM_SCHEMA = _IBOR_SCHEMA
+    _CALENDAR_SCHEMA = (
+        ("settlement_calendar", "settlement_calendar"),
+        ("fixing_calendar", "fixing_calendar"),
+    )
+    _BULLET_FACTORY = "build_bullet_ibor_leg"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_ibor_leg"
 
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
-        leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "settlement_periodicity": leg_gen.settlement_periodicity.as_qcf(),
-            "stub_period": leg_gen.settlement_stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "fixing_periodicity": leg_gen.fixing_periodicity.as_qcf(),
-            "fixing_stub_period": leg_gen.fixing_stub_period.as_qcf(),
-            "fixing_calendar": all_calendars[leg_gen.fixing_calendar],
-            "fixing_lag": leg_gen.fixing_lag,
-            "interest_rate_index": config.InterestRateIndex(leg_gen.interest_rate_index_name).as_qcf(
-                calendars=all_calendars,
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
+        return {
+            "interest_rate_index": _interest_rate_index(
+                self.leg_generator.interest_rate_index_name, _ByIdentity(all_calendars)
             ),
-            "amort_is_cashflow": leg_gen.amort_is_cashflow,
-            "notional_currency": leg_gen.notional_currency.as_qcf(),
-            "spread": leg_gen.spread,
-            "gearing": leg_gen.gearing,
         }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_ibor_leg(**parameters)
-        else:
-            parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_ibor_leg(**parameters)
 
 
 class IborMultiCurrencyLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.IBOR_MCCY] = TypeOfLeg.IBOR_MCCY
     leg_generator: IborLegGenerator
     multi_currency: MultiCurrencyModel
 
-    def custom_dump(self) -> dict[str, Any]:
-        return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(TypeOfAmortization.CUSTOM),
-            **self.multi_currency.model_dump()
-        }
+    _PARAM_SCHEMA = _IBOR_SCHEMA
+    _CALENDAR_SCHEMA = (
+        ("settlement_calendar", "settlement_calendar"),
+        ("fixing_calendar", "fixing_calendar"),
+    )
+    _BULLET_FACTORY = "build_bullet_ibor_mccy_leg"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_ibor_mccy_leg"
 
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
-        leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "settlement_periodicity": leg_gen.settlement_periodicity.as_qcf(),
-            "stub_period": leg_gen.settlement_stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "fixing_periodicity": leg_gen.fixing_periodicity.as_qcf(),
-            "fixing_stub_period": leg_gen.fixing_stub_period.as_qcf(),
-            "fixing_calendar": all_calendars[leg_gen.fixing_calendar],
-            "fixing_lag": leg_gen.fixing_lag,
-            "interest_rate_index": config.InterestRateIndex(leg_gen.interest_rate_index_name).as_qcf(
-                calendars=all_calendars,
-            ),
-            "amort_is_cashflow": leg_gen.amort_is_cashflow,
-            "notional_currency": leg_gen.notional_currency.as_qcf(),
-            "spread": leg_gen.spread,
-            "gearing": leg_gen.gearing,
-            "settlement_currency": self.multi_currency.settlement_currency.as_qcf(),
-            "fx_rate_index": config.FXRateIndex(self.multi_currency.fx_rate_index_name).as_qcf(
-                calendars=all_calendars
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
+        return {
+            "interest_rate_index": _interest_rate_index(
+                self.leg_generator.interest_rate_index_name, _ByIdentity(all_calendars)
             ),
-            "fx_rate_index_fixing_lag": self.multi_currency.fx_fixing_lag,
+            **self._multi_currency_parameters(all_calendars),
         }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_ibor_mccy_leg(**parameters)
-        else:
-            parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_ibor_mccy_leg(**parameters)
 
 
 class OvernightIndexLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.OVERNIGHT_INDEX] = TypeOfLeg.OVERNIGHT_INDEX
     leg_generator: OvernightIndexLegGenerator
 
-    def custom_dump(self):
-        return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(
-                self.leg_generator.type_of_amortization,
-            ),
-        }
+    _PARAM_SCHEMA = _OVERNIGHT_INDEX_SCHEMA + (("fix_adj_rule", "fix_adj_rule", _as_qcf),)
+    _CALENDAR_SCHEMA = (
+        ("settlement_calendar", "settlement_calendar"),
+        ("fixing_calendar", "fixing_calendar"),
+    )
+    _BULLET_FACTORY = "build_bullet_overnight_index_leg"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_overnight_index_leg"
 
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
-        leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "fix_adj_rule": leg_gen.fix_adj_rule.as_qcf(),
-            "settlement_periodicity": leg_gen.settlement_periodicity.as_qcf(),
-            "stub_period": leg_gen.settlement_stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "fixing_calendar": all_calendars[leg_gen.fixing_calendar],
-            "amort_is_cashflow": leg_gen.amort_is_cashflow,
-            "index_name": leg_gen.overnight_index_name,
-            "interest_rate": leg_gen.interest_rate.as_qcf_with_value(0.0),
-            "notional_currency": leg_gen.notional_currency.as_qcf(),
-            "eq_rate_decimal_places": leg_gen.eq_rate_decimal_places,
-            "spread": leg_gen.spread,
-            "gearing": leg_gen.gearing,
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
+        return {
+            "interest_rate": self.leg_generator.interest_rate.as_qcf_with_value(0.0),
         }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_overnight_index_leg(**parameters)
-        else:
-            parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_overnight_index_leg(**parameters)
 
 
 class IcpClfLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.ICP_CLF] = TypeOfLeg.ICP_CLF
     leg_generator: IcpClfLegGenerator
 
-    def custom_dump(self):
-        return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(
-                self.leg_generator.type_of_amortization,
-            ),
-        }
-
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
-        leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "settlement_periodicity": leg_gen.settlement_periodicity.as_qcf(),
-            "stub_period": leg_gen.settlement_stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "amort_is_cashflow": leg_gen.amort_is_cashflow,
-            "spread": leg_gen.spread,
-            "gearing": leg_gen.gearing,
-        }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_icp_clf_leg(**parameters)
-        else:
-            parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_icp_clf_leg(**parameters)
+    _PARAM_SCHEMA = _ICP_CLF_SCHEMA
+    _CALENDAR_SCHEMA = (("settlement_calendar", "settlement_calendar"),)
+    _BULLET_FACTORY = "build_bullet_icp_clf_leg"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_icp_clf_leg"
 
 
 class OvernightIndexMultiCurrencyLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.OVERNIGHT_INDEX_MCCY] = TypeOfLeg.OVERNIGHT_INDEX_MCCY
     leg_generator: OvernightIndexLegGenerator
     multi_currency: MultiCurrencyModel
 
-    def custom_dump(self) -> dict[str, Any]:
+    _PARAM_SCHEMA = _OVERNIGHT_INDEX_SCHEMA
+    _CALENDAR_SCHEMA = (
+        ("settlement_calendar", "settlement_calendar"),
+        ("fixing_calendar", "fixing_calendar"),
+    )
+    _BULLET_FACTORY = "build_bullet_overnight_index_multi_currency_leg"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_overnight_index_multi_currency_leg"
+
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
         return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(
-                self.leg_generator.type_of_amortization,
-            ),
-            **self.multi_currency.model_dump()
+            "fix_adj_rule": qcw.BusAdjRules.PREV.as_qcf(),
+            "interest_rate": self.leg_generator.interest_rate.as_qcf_with_value(0.0),
+            **self._multi_currency_parameters(all_calendars),
         }
 
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
-        leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "fix_adj_rule": leg_gen.bus_adj_rule.PREV.as_qcf(),
-            "settlement_periodicity": leg_gen.settlement_periodicity.as_qcf(),
-            "stub_period": leg_gen.settlement_stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "fixing_calendar": all_calendars[leg_gen.fixing_calendar],
-            "amort_is_cashflow": leg_gen.amort_is_cashflow,
-            "index_name": leg_gen.overnight_index_name,
-            "interest_rate": leg_gen.interest_rate.as_qcf_with_value(0.0),
-            "notional_currency": leg_gen.notional_currency.as_qcf(),
-            "eq_rate_decimal_places": leg_gen.eq_rate_decimal_places,
-            "spread": leg_gen.spread,
-            "gearing": leg_gen.gearing,
-            "settlement_currency": self.multi_currency.settlement_currency.as_qcf(),
-            "fx_rate_index": config.FXRateIndex(
-                self.multi_currency.fx_rate_index_name
-            ).as_qcf(calendars=all_calendars),
-            "fx_rate_index_fixing_lag": self.multi_currency.fx_fixing_lag,
-        }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_overnight_index_multi_currency_leg(**parameters)
-        else:
-            parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_overnight_index_multi_currency_leg(**parameters)
-
 
 class CompoundedOvernightRateLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE] = TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE
     leg_generator: CompoundedOvernightRateLegGenerator
 
-    def custom_dump(self) -> dict[str, Any]:
+    _PARAM_SCHEMA = _COMPOUNDED_OVERNIGHT_RATE_SCHEMA
+    _CALENDAR_SCHEMA = (
+        ("settlement_calendar", "settlement_calendar"),
+        ("fixing_calendar", "fixing_calendar"),
+    )
+    _BULLET_FACTORY = "build_bullet_compounded_overnight_rate_leg_2"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_compounded_overnight_rate_leg_2"
+
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
         return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(
-                self.leg_generator.type_of_amortization,
+            "interest_rate_index": _interest_rate_index(
+                self.leg_generator.overnight_rate_name, _ByIdentity(all_calendars)
             ),
         }
 
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
-        leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "settlement_periodicity": leg_gen.settlement_periodicity.as_qcf(),
-            "settlement_stub_period": leg_gen.settlement_stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "fixing_calendar": all_calendars[leg_gen.fixing_calendar],
-            "interest_rate_index": config.InterestRateIndex(leg_gen.overnight_rate_name).as_qcf(
-                calendars=all_calendars),
-            "cashflow_is_amort": leg_gen.amort_is_cashflow,
-            "notional_currency": leg_gen.notional_currency.as_qcf(),
-            "spread": leg_gen.spread,
-            "gearing": leg_gen.gearing,
-            "interest_rate": leg_gen.interest_rate_type.as_qcf(),
-            "eq_rate_decimal_places": leg_gen.eq_rate_decimal_places,
-            "lookback": leg_gen.lookback,
-            "lockout": leg_gen.lockout,
-        }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_compounded_overnight_rate_leg_2(
-                **parameters
-            )
-        else:
-            parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_compounded_overnight_rate_leg_2(
-                **parameters
-            )
-
 
 class CompoundedOvernightRateMultiCurrencyLegModel(LegModel):
+    type_of_leg: Literal[TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE_MCCY] = TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE_MCCY
     leg_generator: CompoundedOvernightRateLegGenerator
     multi_currency: MultiCurrencyModel
 
-    def custom_dump(self) -> dict[str, Any]:
+    _PARAM_SCHEMA = _COMPOUNDED_OVERNIGHT_RATE_SCHEMA
+    _CALENDAR_SCHEMA = (
+        ("settlement_calendar", "settlement_calendar"),
+        ("fixing_calendar", "fixing_calendar"),
+    )
+    _BULLET_FACTORY = "build_bullet_compounded_overnight_rate_mccy_leg_2"
+    _CUSTOM_AMORT_FACTORY = "build_custom_amort_compounded_overnight_rate_multi_currency_leg_2"
+
+    def _extra_parameters(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> dict[str, Any]:
         return {
-            "type_of_leg": self.type_of_leg,
-            "leg_number": self.leg_number,
-            **self.leg_generator.custom_dump(
-                self.leg_generator.type_of_amortization,
+            "interest_rate_index": _interest_rate_index(
+                self.leg_generator.overnight_rate_name, _ByIdentity(all_calendars)
             ),
-            **self.multi_currency.model_dump()
+            **self._multi_currency_parameters(all_calendars),
         }
 
-    def qcf_leg(self, all_calendars: dict[str, qcf.BusinessCalendar]) -> qcf.Leg:
-        leg_gen = self.leg_generator
-        parameters = {
-            "rec_pay": leg_gen.rp.as_qcf(),
-            "start_date": leg_gen.start_date.as_qcf(),
-            "end_date": leg_gen.end_date.as_qcf(),
-            "bus_adj_rule": leg_gen.bus_adj_rule.as_qcf(),
-            "settlement_periodicity": leg_gen.settlement_periodicity.as_qcf(),
-            "settlement_stub_period": leg_gen.settlement_stub_period.as_qcf(),
-            "settlement_calendar": all_calendars[leg_gen.settlement_calendar],
-            "settlement_lag": leg_gen.settlement_lag,
-            "fixing_calendar": all_calendars[leg_gen.fixing_calendar],
-            "interest_rate_index": config.InterestRateIndex(leg_gen.overnight_rate_name).as_qcf(
-                calendars=all_calendars),
-            "cashflow_is_amort": leg_gen.amort_is_cashflow,
-            "notional_currency": leg_gen.notional_currency.as_qcf(),
-            "spread": leg_gen.spread,
-            "gearing": leg_gen.gearing,
-            "interest_rate": leg_gen.interest_rate_type.as_qcf(),
-            "eq_rate_decimal_places": leg_gen.eq_rate_decimal_places,
-            "lookback": leg_gen.lookback,
-            "lockout": leg_gen.lockout,
-            "fx_rate_index_fixing_lag": self.multi_currency.fx_fixing_lag,
-            "settlement_currency": self.multi_currency.settlement_currency.as_qcf(),
-            "fx_rate_index": config.FXRateIndex(
-                self.multi_currency.fx_rate_index_name
-            ).as_qcf(calendars=all_calendars),
-        }
-        if leg_gen.type_of_amortization == 'BULLET':
-            parameters["initial_notional"] = leg_gen.notional_or_custom.initial_notional
-            return qcf.LegFactory.build_bullet_compounded_overnight_rate_mccy_leg_2(
-                **parameters
-            )
-        else:
-            parameters["notional_and_amort"] = leg_gen.notional_or_custom.as_qcf()
-            return qcf.LegFactory.build_custom_amort_compounded_overnight_rate_multi_currency_leg_2(
-                **parameters
-            )
-
-
-OperationLeg = Union[
-    FixedRateLegModel,
-    FixedRateMultiCurrencyLegModel,
-    IborLegModel,
-    IborMultiCurrencyLegModel,
-    OvernightIndexLegModel,
-    IcpClfLegModel,
-    OvernightIndexMultiCurrencyLegModel,
-    CompoundedOvernightRateLegModel,
-    CompoundedOvernightRateMultiCurrencyLegModel,
+
+# Cada pata fija su `type_of_leg`, por lo que pydantic elige la clase con ese campo sin probar cada alternativa.
+OperationLeg = Annotated[
+    Union[
+        FixedRateLegModel,
+        FixedRateMultiCurrencyLegModel,
+        IborLegModel,
+        IborMultiCurrencyLegModel,
+        OvernightIndexLegModel,
+        IcpClfLegModel,
+        OvernightIndexMultiCurrencyLegModel,
+        CompoundedOvernightRateLegModel,
+        CompoundedOvernightRateMultiCurrencyLegModel,
+    ],
+    Field(discriminator="type_of_leg"),
 ]
 
+_LEG_MODEL_BY_TYPE: dict[TypeOfLeg, type[LegModel]] = {
+    TypeOfLeg.FIXED_RATE: FixedRateLegModel,
+    TypeOfLeg.FIXED_RATE_MCCY: FixedRateMultiCurrencyLegModel,
+    TypeOfLeg.IBOR: IborLegModel,
+    TypeOfLeg.IBOR_MCCY: IborMultiCurrencyLegModel,
+    TypeOfLeg.OVERNIGHT_INDEX: OvernightIndexLegModel,
+    TypeOfLeg.OVERNIGHT_INDEX_MCCY: OvernightIndexMultiCurrencyLegModel,
+    TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE: CompoundedOvernightRateLegModel,
+    TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE_MCCY: CompoundedOvernightRateMultiCurrencyLegModel,
+    TypeOfLeg.ICP_CLF: IcpClfLegModel,
+}
+
+
+def _coerce_trusted(annotation: Any, value: Any) -> Any:
+    """
+    Convierte `value` al tipo `annotation` sin pasar por la validación de pydantic.
+    """
+    if not isinstance(annotation, type) or isinstance(value, annotation):
+        return value
+    if issubclass(annotation, Enum):
+        return annotation(value)
+    if annotation is qcw.Fecha:
+        return qcw.Fecha(fecha=value)
+    if issubclass(annotation, BaseModel):
+        return _construct_trusted(annotation, value)
+    if is_dataclass(annotation):
+        return annotation(**value)
+    return value
+
+
+def _construct_trusted(model_cls: type[BaseModel], data: dict[str, Any]) -> BaseModel:
+    """
+    Construye `model_cls` con `model_construct` a partir de los campos de `model_cls` presentes en `data`.
+    """
+    values = {
+        name: _coerce_trusted(field.annotation, data[name])
+        for name, field in model_cls.model_fields.items()
+        if name in data
+    }
+    return model_cls.model_construct(**values)
+
+
+def _leg_from_trusted_dict(data: dict[str, Any]) -> OperationLeg:
+    """
+    Construye una pata a partir del resultado de `custom_dump`, que aplana el Leg Generator y el
+    `MultiCurrencyModel` en un solo diccionario.
+    """
+    type_of_leg = TypeOfLeg(data["type_of_leg"])
+    leg_cls = _LEG_MODEL_BY_TYPE[type_of_leg]
+    generator_cls = leg_cls.model_fields["leg_generator"].annotation
+
+    if "initial_notional" in data:
+        notional_or_custom = InitialNotional(initial_notional=data["initial_notional"])
+    else:
+        notional_or_custom = CustomNotionalAmort.model_construct(
+            custom_notional_amort=[tuple(na) for na in data["custom_notional_amort"]],
+        )
+
+    values = {
+        "type_of_leg": type_of_leg,
+        "leg_number": data["leg_number"],
+        "leg_generator": _construct_trusted(
+            generator_cls,
+            {**data, "notional_or_custom": notional_or_custom},
+        ),
+    }
+    if "multi_currency" in leg_cls.model_fields:
+        values["multi_currency"] = _construct_trusted(MultiCurrencyModel, data)
+    return leg_cls.model_construct(**values)
+
 
 class Operation(BaseModel):
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
     )
-    trade_date: qcw.Fecha
+    trade_date: qcw.FechaSer
     deal_number: str
     counterparty_name: str
     counterparty_rut: Rut
@@ -744,9 +862,32 @@ class Operation(BaseModel):
     settlement_mechanism: str
     legs: list[OperationLeg]
 
-    @field_serializer('trade_date')
-    def serialize_date(self, dt: qcw.Fecha):
-        return dt.fecha
+    @classmethod
+    def from_trusted_dict(cls, data: dict[str, Any]) -> "Operation":
+        """
+        Construye una `Operation` a partir del resultado de `custom_dump` sin ejecutar la validación de pydantic.
+
+        Los modelos anidados se construyen con `model_construct` y los campos se convierten a su tipo según
+        la anotación de cada campo. Esto omite todos los validadores, incluidos el dígito verificador del RUT
+        y el reemplazo de espacios en `interest_rate_index_name`, por lo que sólo debe usarse con datos de
+        origen confiable, por ejemplo, operaciones almacenadas previamente con `custom_dump`.
+
+        Parameters
+        ----------
+        data: dict[str, Any]
+            Diccionario con el formato de `custom_dump`.
+
+        Returns
+        -------
+        La `Operation` correspondiente.
+        """
+        values = {
+            name: _coerce_trusted(field.annotation, data[name])
+            for name, field in cls.model_fields.items()
+            if name in data and name != "legs"
+        }
+        values["legs"] = [_leg_from_trusted_dict(leg) for leg in data["legs"]]
+        return cls.model_construct(**values)
 
     def custom_dump(self):
         return {
@@ -1,14 +1,20 @@
+import pandas as pd
+
 from . import config as config
 from . import market_data as qcv
 from datetime import date
-from typing import List, Tuple
+from itertools import chain
+from typing import List, Optional, Tuple
 
 
-def get_regulatory_cashflows(
-        process_date: date,
-        operations: List[qcv.Operation],
-        is_prod: bool,
-) -> List[Tuple[str, str, str, str, str, float, float]]:
+def build_regulatory_cashflow_for_leg(process_date: date, is_prod: bool) -> qcv.GetRegulatoryCashflowForLeg:
+    """
+    Construye la data estática (curvas y calendarios) y el `GetRegulatoryCashflowForLeg` de una fecha de proceso.
+
+    Un proceso por lotes puede construirlo una vez y pasarlo a cada llamada de `get_regulatory_cashflows`.
+    No se memoiza entre llamadas: la data estática quedaría desactualizada y el cálculo de fixings modifica
+    las patas.
+    """
     sd = qcv.build_static_data(
         process_date=process_date,
         initial_date=date(2019, 1, 1),
@@ -20,17 +26,38 @@ def get_regulatory_cashflows(
         market_data=sd,
     )
 
-    get_reg = qcv.GetRegulatoryCashflowForLeg(
+    return qcv.GetRegulatoryCashflowForLeg(
         get_fixing=get_fixing,
         sd=sd,
     )
 
-    result = []
-    for op in operations:
-        for leg in op.legs:
-            result += get_reg(
-                process_date=process_date,
-                leg=leg
-            )
 
-    return result
+def get_regulatory_cashflows(
+        process_date: date,
+        operations: List[qcv.Operation],
+        is_prod: bool,
+        get_reg: Optional[qcv.GetRegulatoryCashflowForLeg] = None,
+) -> List[Tuple[str, str, str, str, str, float, float]]:
+    """
+    Retorna los flujos regulatorios de todas las patas de `operations`. Si no se entrega `get_reg`, se construye
+    con `build_regulatory_cashflow_for_leg`.
+    """
+    if get_reg is None:
+        get_reg = build_regulatory_cashflow_for_leg(process_date, is_prod)
+    all_legs = [leg for op in operations for leg in op.legs]
+    return list(chain.from_iterable(get_reg(process_date, leg) for leg in all_legs))
+
+
+def get_regulatory_cashflows_frame(
+        process_date: date,
+        operations: List[qcv.Operation],
+        is_prod: bool,
+        get_reg: Optional[qcv.GetRegulatoryCashflowForLeg] = None,
+) -> pd.DataFrame:
+    """
+    Igual que `get_regulatory_cashflows`, pero retorna los flujos por columnas en un `pd.DataFrame`,
+    con los montos como arreglos `np.float64`.
+    """
+    return qcv.GetRegulatoryCashflowForLeg.as_dataframe(
+        get_regulatory_cashflows(process_date, operations, is_prod, get_reg)
+    )
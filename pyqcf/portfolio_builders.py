@@ -1,17 +1,20 @@
 # Portfolio Builders
+from dataclasses import dataclass as plain_dataclass, field
+
+import numpy as np
 import pandas as pd
 
 from data_services import data_front_desk as dfd
 from . import market_data as qcv
 from . import config as config
 
-from typing import List
+from typing import Any, Iterable, List
 from datetime import date
 
 from pydantic.dataclasses import dataclass
 
 
-@dataclass
+@plain_dataclass(slots=True)
 class GetSwaps:
     """
     Permite construir operaciones swap filtrando por distintos criterios.
@@ -19,8 +22,21 @@ class GetSwaps:
     process_date: date
     sd: qcv.StaticData
     is_prod: bool
-
-    def __post_init_post_parse__(self):
+    all_headers: pd.DataFrame = field(init=False, repr=False, compare=False)
+    fx_rate_ccs: Any = field(init=False, repr=False, compare=False)
+    fixed_rate_headers: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    fixed_rate_cashflows: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    icp_headers: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    icp_cashflows: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    sofrindx_headers: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    sofrindx_cashflows: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    sofrrate_headers: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    sofrrate_cashflows: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    floating_rate_headers: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    floating_rate_cashflows: pd.DataFrame | None = field(init=False, repr=False, compare=False)
+    __deal_positions: dict[str, dict] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
         self.all_headers = dfd.get_all_swaps_headers(self.process_date)
         self.fx_rate_ccs = qcv.get_fx_rate_ccs(self.process_date)
         self.fixed_rate_headers = None
@@ -33,6 +49,8 @@ class GetSwaps:
         self.sofrrate_cashflows = None
         self.floating_rate_headers = None
         self.floating_rate_cashflows = None
+        # Posiciones de las filas de cada DataFrame de headers, agrupadas por número de operación.
+        self.__deal_positions = {}
 
     def __get_fixed_rate_legs_data(self):
         self.fixed_rate_headers, self.fixed_rate_cashflows = dfd.get_fixed_rate_legs_for_qcf(
@@ -69,6 +87,39 @@ class GetSwaps:
             is_prod=self.is_prod,
         )
 
+    def __get_legs_data(self):
+        """
+        Descarga los datos de los tipos de pata que aún no se han descargado. Las consultas se hacen en
+        secuencia: `dfd` no garantiza que su conexión a la base de datos se pueda usar desde varios threads.
+        """
+        for headers, get_data in (
+                (self.fixed_rate_headers, self.__get_fixed_rate_legs_data),
+                (self.icp_headers, self.__get_icp_legs_data),
+                (self.sofrindx_headers, self.__get_sofrindx_legs_data),
+                (self.sofrrate_headers, self.__get_sofrrate_legs_data),
+                (self.floating_rate_headers, self.__get_floating_rate_legs_data),
+        ):
+            if headers is None:
+                get_data()
+
+    def __headers_for_deals(self, name: str, deal_numbers: set[str]) -> pd.DataFrame:
+        """
+        Retorna las filas del DataFrame de headers `name` cuyo `numero_operacion` está en `deal_numbers`,
+        en su orden original.
+
+        Las posiciones de las filas de cada operación se calculan una sola vez por DataFrame, por lo que
+        el filtro se reduce a búsquedas en un diccionario.
+        """
+        headers = getattr(self, name)
+        positions = self.__deal_positions.get(name)
+        if positions is None:
+            positions = headers.groupby('numero_operacion', sort=False).indices
+            self.__deal_positions[name] = positions
+        found = [positions[deal_number] for deal_number in deal_numbers if deal_number in positions]
+        if len(found) == 0:
+            return headers.iloc[:0]
+        return headers.iloc[np.sort(np.concatenate(found))]
+
     def all(self) -> List[qcv.Operation]:
         """
         """
@@ -77,11 +128,9 @@ class GetSwaps:
         patas_sofrindx = None
         patas_ibor = None
         patas_sofrrate = None
+        self.__get_legs_data()
 
         # Construye Patas Fijas
-        if self.fixed_rate_headers is None:
-            self.__get_fixed_rate_legs_data()
-
         if len(self.fixed_rate_headers) > 0:
             patas_fijas = qcv.build_qcf_fixed_rate_legs(
                 self.fixed_rate_headers,
@@ -91,9 +140,6 @@ class GetSwaps:
             )
 
         # Construye Patas ICP
-        if self.icp_headers is None:
-            self.__get_icp_legs_data()
-
         if len(self.icp_headers) > 0:
             patas_icp = qcv.build_qcf_icp_legs(
                 self.icp_headers,
@@ -103,9 +149,6 @@ class GetSwaps:
             )
 
         # Construye Patas SOFRINDX
-        if self.sofrindx_headers is None:
-            self.__get_sofrindx_legs_data()
-
         if len(self.sofrindx_headers) > 0:
             patas_sofrindx = qcv.build_sofrindx_legs(
                 self.sofrindx_headers,
@@ -115,9 +158,6 @@ class GetSwaps:
             )
 
         # Construye Patas SOFRRATE
-        if self.sofrrate_headers is None:
-            self.__get_sofrrate_legs_data()
-
         if len(self.sofrrate_headers) > 0:
             patas_sofrrate = qcv.build_sofrrate_legs(
                 self.sofrrate_headers,
@@ -128,9 +168,6 @@ class GetSwaps:
             )
 
         # Construye Patas Flotantes
-        if self.floating_rate_headers is None:
-            self.__get_floating_rate_legs_data()
-
         if len(self.floating_rate_headers) > 0:
             patas_ibor = qcv.build_qcf_ibor_legs(
                 self.floating_rate_headers,
@@ -150,20 +187,23 @@ class GetSwaps:
             patas_sofrrate,
         )
 
-    def by_deal_number(self, deal_numbers: List[str]) -> List[qcv.Operation]:
+    def by_deal_number(self, deal_numbers: Iterable[str]) -> List[qcv.Operation]:
         """
         """
+        deal_numbers = set(deal_numbers)
+        if deal_numbers.isdisjoint(self.all_headers.numero_operacion):
+            # Ninguna de las operaciones es un swap vigente, no es necesario descargar las patas.
+            return qcv.get_swap_operations(self.all_headers, None, None, None, None, None)
+
         patas_fijas = None
         patas_icp = None
         patas_sofrindx = None
         patas_ibor = None
         patas_sofrrate = None
+        self.__get_legs_data()
 
         # Construye Patas Fijas
-        if self.fixed_rate_headers is None:
-            self.__get_fixed_rate_legs_data()
-
-        headers = self.fixed_rate_headers[self.fixed_rate_headers.numero_operacion.isin(deal_numbers)]
+        headers = self.__headers_for_deals('fixed_rate_headers', deal_numbers)
         if len(headers) > 0:
             patas_fijas = qcv.build_qcf_fixed_rate_legs(
                 headers,
@@ -173,10 +213,7 @@ class GetSwaps:
             )
 
         # Construye Patas ICP
-        if self.icp_headers is None:
-            self.__get_icp_legs_data()
-
-        headers = self.icp_headers[self.icp_headers.numero_operacion.isin(deal_numbers)]
+        headers = self.__headers_for_deals('icp_headers', deal_numbers)
         if len(headers) > 0:
             patas_icp = qcv.build_qcf_icp_legs(
                 headers,
@@ -186,10 +223,7 @@ class GetSwaps:
             )
 
         # Construye Patas SOFRINDX
-        if self.sofrindx_headers is None:
-            self.__get_sofrindx_legs_data()
-
-        headers = self.sofrindx_headers[self.sofrindx_headers.numero_operacion.isin(deal_numbers)]
+        headers = self.__headers_for_deals('sofrindx_headers', deal_numbers)
         if len(headers) > 0:
             patas_sofrindx = qcv.build_sofrindx_legs(
                 headers,
@@ -199,10 +233,7 @@ class GetSwaps:
             )
 
         # Construye Patas SOFRRATE
-        if self.sofrrate_headers is None:
-            self.__get_sofrrate_legs_data()
-
-        headers = self.sofrrate_headers[self.sofrrate_headers.numero_operacion.isin(deal_numbers)]
+        headers = self.__headers_for_deals('sofrrate_headers', deal_numbers)
         if len(headers) > 0:
             patas_sofrrate = qcv.build_sofrrate_legs(
                 self.sofrrate_headers,
@@ -213,10 +244,7 @@ class GetSwaps:
             )
 
         # Construye Patas Flotantes
-        if self.floating_rate_headers is None:
-            self.__get_floating_rate_legs_data()
-
-        headers = self.floating_rate_headers[self.floating_rate_headers.numero_operacion.isin(deal_numbers)]
+        headers = self.__headers_for_deals('floating_rate_headers', deal_numbers)
         if len(headers) > 0:
             patas_ibor = qcv.build_qcf_ibor_legs(
                 headers,
@@ -237,9 +265,8 @@ class GetSwaps:
         )
 
     def hedge_accounting(self) -> List[qcv.Operation]:
-        headers = self.all_headers[self.all_headers.es_cobertura == 'S']
-        deal_numbers = list(headers.numero_operacion.values)
-        return self.by_deal_number(deal_numbers)
+        is_hedge = (self.all_headers.es_cobertura == 'S').values
+        return self.by_deal_number(frozenset(self.all_headers.numero_operacion.values[is_hedge]))
 
 
 @dataclass
@@ -260,11 +287,11 @@ class GetForwards:
     
     def only_market_risk(self, dt_date_next) -> List[qcv.Operation]:
         data_forwards = dfd.get_forwards_headers(self.process_date, is_offline=False, is_prod=self.is_prod)
-        data_fwd_ndf = data_forwards[data_forwards.modalidad_pago == 'C'].copy()
-        data_fwd_ndf = data_fwd_ndf[['fecha_proceso', 'fecha_final']]
-        data_fwd_ndf.fecha_final = pd.to_datetime(data_fwd_ndf.fecha_final, format='%Y-%m-%d')
-
-        lt_index = data_fwd_ndf[data_fwd_ndf.fecha_final <= dt_date_next].index
-        data_forwards = data_forwards[~ data_forwards.index.isin(lt_index)]
+        # Sólo se parsea la fecha final de los NDF, que son las únicas filas que se filtran por ella.
+        is_ndf = (data_forwards.modalidad_pago == 'C').values
+        fecha_final_ndf = pd.to_datetime(data_forwards.fecha_final.values[is_ndf], format='%Y-%m-%d')
+        vencidos = is_ndf.copy()
+        vencidos[is_ndf] = fecha_final_ndf <= pd.Timestamp(dt_date_next)
+        data_forwards = data_forwards[~vencidos]
         data_forwards = data_forwards.to_dict('records')
         return qcv.build_qcf_forwards(data_forwards)
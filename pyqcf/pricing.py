@@ -1,7 +1,7 @@
 from enum import Enum
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 import qcfinancial as qcf
 from . import wrappers as qcw
@@ -57,13 +57,36 @@ class LegTemplate(ABC):
     def build_leg(self, other: Dict[LegParameters, Any]) -> qcf.Leg:
         pass
 
+    def build_leg_cached(self, other: Dict[LegParameters, Any]) -> qcf.Leg:
+        """
+        Igual que `build_leg`. Sirve cuando la misma pata se construye muchas veces (por ejemplo, al sensibilizar
+        curvas): los templates que pueden memoizar parte de la construcción lo sobreescriben.
+
+        Siempre retorna una pata nueva, que se puede modificar (por ejemplo, fijando las tasas de sus flujos)
+        sin afectar a otras llamadas.
+        """
+        return self.build_leg(other)
+
 
 class OperationBuilder(BaseModel):
     leg_templates: List[LegTemplate]
+    _templates_by_name: Dict[str, LegTemplate] | None = PrivateAttr(default=None)
 
     class Config:
         arbitrary_types_allowed = True
 
+    def _template(self, nombre: str) -> LegTemplate:
+        """
+        Retorna el primer template de `leg_templates` con nombre `nombre`. Los templates se indexan por
+        nombre la primera vez que se llama.
+        """
+        if self._templates_by_name is None:
+            templates_by_name = {}
+            for template in self.leg_templates:
+                templates_by_name.setdefault(template.nombre, template)
+            self._templates_by_name = templates_by_name
+        return self._templates_by_name[nombre]
+
     def mkt_icpclp(
         self,
         deal_number: str,
@@ -74,12 +97,8 @@ class OperationBuilder(BaseModel):
         """
         Retorna una operación ICPCLP estándar de mercado.
         """
-        fixed_rate_template = [
-            t for t in self.leg_templates if t.nombre == "Fix6MCLPCLP"
-        ][0]
-        icpclp_leg_template = [t for t in self.leg_templates if t.nombre == "IcpClp6M"][
-            0
-        ]
+        fixed_rate_template = self._template("Fix6MCLPCLP")
+        icpclp_leg_template = self._template("IcpClp6M")
 
         fixed_rate_leg = fixed_rate_template.build_leg(data_pata_fija)
         icpclp_leg = icpclp_leg_template.build_leg(data_pata_icp)
@@ -139,12 +158,8 @@ class OperationBuilder(BaseModel):
         """
         Retorna una operación CCS UF Fija vs ICPLP estándar de mercado.
         """
-        fixed_rate_template = [t for t in self.leg_templates if t.nombre == "Fix6MCLF"][
-            0
-        ]
-        icpclp_leg_template = [t for t in self.leg_templates if t.nombre == "IcpClp6M"][
-            0
-        ]
+        fixed_rate_template = self._template("Fix6MCLF")
+        icpclp_leg_template = self._template("IcpClp6M")
 
         fixed_rate_leg = fixed_rate_template.build_leg(data_pata_fija)
         icpclp_leg = icpclp_leg_template.build_leg(data_pata_icp)
@@ -1,6 +1,8 @@
 # Funciones para el cálculo del vencimiento de cupones de swaps
 
-from pydantic import BaseModel, PositiveInt, ConfigDict
+from dataclasses import dataclass
+from functools import total_ordering
+from operator import attrgetter
 
 from qcf_valuation import qcf_wrappers as qcw, core as qcv
 import qcfinancial as qcf
@@ -11,12 +13,14 @@ from . import fixings as fix
 from ..models import operations_2 as op
 
 
-class DealNumber(BaseModel):
+@dataclass(slots=True)
+class DealNumber:
     deal_number: str
 
 
+@dataclass(slots=True)
 class SettlingOperation(DealNumber):
-    leg_numbers: set[PositiveInt]
+    leg_numbers: set[int]
 
 
 def get_settlements(
@@ -41,25 +45,53 @@ def get_settlements(
     deal_number_leg = []
     bad_deal_numbers = []
     all_swaps = swaps.get_all_deal_numbers()
+    # La fecha de corte y los calendarios son los mismos para todas las patas.
+    cutoff = settlement_date.as_qcf()
+    calendars = market_data.calendars
+    add_settling = deal_number_leg.append
+    add_bad = bad_deal_numbers.append
     for deal_number, operation in all_swaps.items():
         legs = set()
         try:
             for leg in operation.legs:
-                cashflow = leg.get_current_cashflow(process_date, market_data.calendars)
-                if cashflow.get_end_date() <= settlement_date.as_qcf():
+                if leg.get_current_cashflow(process_date, calendars).get_end_date() <= cutoff:
                     legs.add(leg.leg_number)
-        except IndexError as e:
-            bad_deal_numbers.append(DealNumber(deal_number=deal_number))
-        if len(legs) > 0:
-            deal_number_leg.append(SettlingOperation(deal_number=deal_number, leg_numbers=legs))
+        except IndexError:
+            add_bad(DealNumber(deal_number=deal_number))
+        if legs:
+            add_settling(SettlingOperation(deal_number=deal_number, leg_numbers=legs))
     return deal_number_leg, bad_deal_numbers
 
 
-def get_settling_operation(deal_number: DealNumber, settling_operations: list[SettlingOperation]):
+def _deal_number_str(deal_number: DealNumber | str) -> str:
+    return deal_number.deal_number if isinstance(deal_number, DealNumber) else deal_number
+
+
+def get_settling_operation(deal_number: DealNumber | str, settling_operations: list[SettlingOperation]):
+    deal_number = _deal_number_str(deal_number)
     return [sett_op for sett_op in settling_operations if sett_op.deal_number == deal_number]
 
 
-class SettlementInfoForLeg(BaseModel):
+class SettlingOperationIndex:
+    """
+    Indexa una lista de `SettlingOperation` por número de operación. Para buscar muchas operaciones
+    conviene construir el índice una vez en vez de llamar repetidamente a `get_settling_operation`.
+
+    Args:
+        settling_operations (list[SettlingOperation]): Resultado de `get_settlements`.
+    """
+    def __init__(self, settling_operations: list[SettlingOperation]):
+        self.settling_operations = {sett_op.deal_number: sett_op for sett_op in settling_operations}
+
+    def get(self, deal_number: DealNumber | str) -> SettlingOperation | None:
+        """
+        Retorna el `SettlingOperation` de `deal_number` o `None` si la operación no tiene vencimientos.
+        """
+        return self.settling_operations.get(_deal_number_str(deal_number))
+
+
+@dataclass(slots=True)
+class SettlementInfoForLeg:
     """
     Modela la información de vencimiento de un cashflow de una pata:
     - Número de pata
@@ -72,10 +104,7 @@ class SettlementInfoForLeg(BaseModel):
     - Moneda del vencimiento
     - Monto del vencimiento
     """
-    model_config = ConfigDict(
-        arbitrary_types_allowed=True,
-    )
-    leg_number: PositiveInt
+    leg_number: int
     rec_pay: qcw.AP
     current_notional: float
     start_date: qcf.QCDate
@@ -99,7 +128,9 @@ class SettlementInfoForLeg(BaseModel):
         }
 
 
-class SettlementInfo(BaseModel):
+@total_ordering
+@dataclass(slots=True)
+class SettlementInfo:
     """
     Modela la información principal sobre el vencimiento de un cupón de swap, esta es:
 
@@ -113,12 +144,10 @@ class SettlementInfo(BaseModel):
     Luego, por cada una de las patas con vencimiento
     - SettlementInfoForLeg
 
-    Define los métodos __lt__ y __eq__ para ordenar resultados por número de operación y pata.
+    Define los métodos __lt__, __eq__ y __hash__ para ordenar resultados por número de operación. Cada operación
+    tiene un solo `SettlementInfo`, con todas sus patas en `legs`.
 
     """
-    model_config = ConfigDict(
-        arbitrary_types_allowed=True,
-    )
     deal_number: str
     product: op.Product
     counterparty_name: str
@@ -128,14 +157,17 @@ class SettlementInfo(BaseModel):
     legs: list[SettlementInfoForLeg]
 
     def __lt__(self, other):
-        if self.deal_number == other.deal_number:
-            return self.leg_number < other.leg_number
-        else:
-            return self.deal_number.__lt__(other.deal_number)
+        if not isinstance(other, SettlementInfo):
+            return NotImplemented
+        return self.deal_number < other.deal_number
 
     def __eq__(self, other):
-        return (self.deal_number == other.deal_number) and (
-                self.leg_number == other.leg_number)
+        if not isinstance(other, SettlementInfo):
+            return NotImplemented
+        return self.deal_number == other.deal_number
+
+    def __hash__(self):
+        return hash(self.deal_number)
 
     def custom_dump(self):
         return {
@@ -149,6 +181,28 @@ class SettlementInfo(BaseModel):
         }
 
 
+def _fixed_rate_name(leg_generator) -> str:
+    return 'FIXED'
+
+
+def _icp_clf_rate_name(leg_generator) -> str:
+    return 'ICPCLF'
+
+
+# Nombre de la tasa de interés que se informa en el vencimiento, según el tipo de pata. Las patas que no
+# están en la tabla son ICP CLF.
+_INTEREST_RATE_NAME = {
+    op.TypeOfLeg.FIXED_RATE: _fixed_rate_name,
+    op.TypeOfLeg.FIXED_RATE_MCCY: _fixed_rate_name,
+    op.TypeOfLeg.IBOR: attrgetter("interest_rate_index_name"),
+    op.TypeOfLeg.IBOR_MCCY: attrgetter("interest_rate_index_name"),
+    op.TypeOfLeg.OVERNIGHT_INDEX: attrgetter("overnight_index_name"),
+    op.TypeOfLeg.OVERNIGHT_INDEX_MCCY: attrgetter("overnight_index_name"),
+    op.TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE: attrgetter("overnight_rate_name"),
+    op.TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE_MCCY: attrgetter("overnight_rate_name"),
+}
+
+
 def calculate_settlement(
         process_date: qcw.Fecha,
         operation_and_legs: SettlingOperation,
@@ -171,38 +225,25 @@ def calculate_settlement(
     deal_number = operation_and_legs.deal_number
     legs = []
     operation = swaps.get_deal_number(deal_number)
+    operation_legs = operation.legs
+    calendars = market_data.calendars
     for leg_number in operation_and_legs.leg_numbers:
-        leg_number -= 1
-        cashflow = operation.legs[leg_number].get_current_cashflow(process_date, market_data.calendars)
+        leg = operation_legs[leg_number - 1]
+        leg_generator = leg.leg_generator
+        cashflow = leg.get_current_cashflow(process_date, calendars)
         fix.fix_cashflow(cashflow, market_data)
 
-        if operation.legs[leg_number].type_of_leg in [op.TypeOfLeg.FIXED_RATE,
-                                                      op.TypeOfLeg.FIXED_RATE_MCCY]:
-            interest_rate = 'FIXED'
-        elif operation.legs[leg_number].type_of_leg in [op.TypeOfLeg.IBOR,
-                                                        op.TypeOfLeg.IBOR_MCCY]:
-            interest_rate = operation.legs[leg_number].leg_generator.interest_rate_index_name
-
-        elif operation.legs[leg_number].type_of_leg in [op.TypeOfLeg.OVERNIGHT_INDEX,
-                                                        op.TypeOfLeg.OVERNIGHT_INDEX_MCCY]:
-            interest_rate = operation.legs[leg_number].leg_generator.overnight_index_name
-
-        elif operation.legs[leg_number].type_of_leg in [op.TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE,
-                                                        op.TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE_MCCY]:
-            interest_rate = operation.legs[leg_number].leg_generator.overnight_rate_name
-
-        else:
-            interest_rate = 'ICPCLF'
+        interest_rate = _INTEREST_RATE_NAME.get(leg.type_of_leg, _icp_clf_rate_name)(leg_generator)
 
         legs.append(SettlementInfoForLeg(
-            leg_number=leg_number + 1,
-            rec_pay=operation.legs[leg_number].leg_generator.rp,
+            leg_number=leg_number,
+            rec_pay=leg_generator.rp,
             current_notional=cashflow.get_nominal(),
             start_date=cashflow.get_start_date(),
             end_date=cashflow.get_end_date(),
             settlement_date=cashflow.get_settlement_date(),
             interest_rate=interest_rate,
-            settlement_currency=cashflow.settlement_currency().get_iso_code(),
+            settlement_currency=qcw.Currency(cashflow.settlement_currency().get_iso_code()),
             settlement_amount=cashflow.settlement_amount(),
         ))
 
@@ -215,3 +256,30 @@ def calculate_settlement(
         settlement_mechanism=op.SettlementMechanism(operation.settlement_mechanism),
         legs=legs,
     )
+
+
+def calculate_settlements(
+        process_date: qcw.Fecha,
+        settling_operations: list[SettlingOperation],
+        swaps: dto.DerivativePortfolio,
+        market_data: qcv.MarketData,
+) -> list[SettlementInfo]:
+    """
+    Calcula los vencimientos de varias operaciones swap. Los valores de los índices que se usan en los fixings
+    se consultan una sola vez para todas las operaciones.
+
+    Args:
+        process_date (qcw.Fecha): fecha a la que se realiza el cálculo.
+        settling_operations (list[SettlingOperation]): Números de operación y de pata, ver `get_settlements`.
+        swaps (dto.DerivativePortfolio): Objeto que almacena la data de todos los swaps vigentes.
+        market_data (qcv.MarketData): Objeto con los datos de mercado requeridos para los fixings.
+
+    Returns:
+        list[SettlementInfo]: Un `SettlementInfo` por cada elemento de `settling_operations`.
+
+    """
+    cached_market_data = fix.CachedIndexValues(market_data)
+    return [
+        calculate_settlement(process_date, operation_and_legs, swaps, cached_market_data)
+        for operation_and_legs in settling_operations
+    ]
@@ -1,4 +1,7 @@
-from typing import Dict, Any
+from abc import abstractmethod
+from functools import cache, lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 from datetime import date
 
 from .pricing import LegTemplate, LegParameters
@@ -11,103 +14,166 @@ if sys.platform in ["win32", "darwin"]:
 else:
     import qc_financial as qcf
 
+# Objetos de `qcfinancial` compartidos por los valores por defecto de los templates.
+_TENOR_6M = qcf.Tenor('6M')
+_QCCLF = qcf.QCCLF()
+_QCCLP = qcf.QCCLP()
+_MOD_FOLLOW = qcf.BusyAdjRules.MODFOLLOW
+_SHORT_FRONT = qcf.StubPeriod.SHORTFRONT
+
+# Número máximo de pares (fecha de curse, plazo) cuyas fechas de inicio y final guarda `build_leg_cached`.
+_MAX_CACHED_START_END = 256
+
 # Hate this. There has to be a better way.
 # Maybe some sort of dependency injection.
-cals = get_calendars(date(2021, 1, 1), is_prod=True)
+@cache
+def _cals():
+    """
+    Calendarios que usan los templates. Se cargan la primera vez que se necesitan y no al importar el módulo.
+    """
+    return get_calendars(date(2021, 1, 1), is_prod=True)
 
 
-class Fix6MCLF(LegTemplate):
-    def __init__(
-        self,
-        nombre='Fix6MCLF',
-        default={
-            LegParameters.LAG_INICIO: 2,
-            LegParameters.BUS_ADJ_RULE: qcf.BusyAdjRules.MODFOLLOW,
-            LegParameters.PERIODICIDAD_PAGO: qcf.Tenor('6M'),
-            LegParameters.LAG_PAGO: 0,
-            LegParameters.STUB_PERIOD_PAGO: qcf.StubPeriod.SHORTFRONT,
-            LegParameters.CALENDARIO_PAGO: cals['SCL'],
-            LegParameters.MONEDA_NOCIONAL: qcf.QCCLF(),
-            LegParameters.MONEDA_PAGO: qcf.QCCLP(),
-            LegParameters.INDICE_FX: 'UF',
-            LegParameters.LAG_FIXING_FX: 0,
-            LegParameters.AMORT_ES_FLUJO: True,
-            LegParameters.TIPO_TASA: qcw.TypeOfRate.LINACT360,
-            LegParameters.ES_BONO: False,
-        }
-    ):
+def __getattr__(name: str):
+    # Mantiene disponible `templates.cals` sin cargar los calendarios al importar el módulo.
+    if name == "cals":
+        return _cals()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Valores por defecto de los templates. Se construyen una sola vez, la primera vez que se usan, y son de sólo
+# lectura.
+@cache
+def _fix6mclf_defaults() -> Mapping[LegParameters, Any]:
+    return MappingProxyType({
+        LegParameters.LAG_INICIO: 2,
+        LegParameters.BUS_ADJ_RULE: _MOD_FOLLOW,
+        LegParameters.PERIODICIDAD_PAGO: _TENOR_6M,
+        LegParameters.LAG_PAGO: 0,
+        LegParameters.STUB_PERIOD_PAGO: _SHORT_FRONT,
+        LegParameters.CALENDARIO_PAGO: _cals()['SCL'],
+        LegParameters.MONEDA_NOCIONAL: _QCCLF,
+        LegParameters.MONEDA_PAGO: _QCCLP,
+        LegParameters.INDICE_FX: 'UF',
+        LegParameters.LAG_FIXING_FX: 0,
+        LegParameters.AMORT_ES_FLUJO: True,
+        LegParameters.TIPO_TASA: qcw.TypeOfRate.LINACT360,
+        LegParameters.ES_BONO: False,
+    })
+
+
+@cache
+def _fix6mclpclp_defaults() -> Mapping[LegParameters, Any]:
+    return MappingProxyType({
+        LegParameters.LAG_INICIO: 2,
+        LegParameters.BUS_ADJ_RULE: _MOD_FOLLOW,
+        LegParameters.PERIODICIDAD_PAGO: _TENOR_6M,
+        LegParameters.LAG_PAGO: 0,
+        LegParameters.STUB_PERIOD_PAGO: _SHORT_FRONT,
+        LegParameters.CALENDARIO_PAGO: _cals()['SCL'],
+        LegParameters.MONEDA_NOCIONAL: _QCCLP,
+        LegParameters.MONEDA_PAGO: _QCCLP,
+        LegParameters.INDICE_FX: '1CLP',
+        LegParameters.LAG_FIXING_FX: 0,
+        LegParameters.AMORT_ES_FLUJO: True,
+        LegParameters.TIPO_TASA: qcw.TypeOfRate.LINACT360,
+        LegParameters.ES_BONO: False,
+    })
+
+
+@cache
+def _icpclp6m_defaults() -> Mapping[LegParameters, Any]:
+    return MappingProxyType({
+        LegParameters.LAG_INICIO: 2,
+        LegParameters.BUS_ADJ_RULE: _MOD_FOLLOW,
+        LegParameters.PERIODICIDAD_PAGO: _TENOR_6M,
+        LegParameters.LAG_PAGO: 0,
+        LegParameters.STUB_PERIOD_PAGO: _SHORT_FRONT,
+        LegParameters.CALENDARIO_PAGO: _cals()['SCL'],
+        LegParameters.MONEDA_NOCIONAL: _QCCLP,
+        LegParameters.MONEDA_PAGO: _QCCLP,
+        LegParameters.INDICE_FX: '1CLP',
+        LegParameters.LAG_FIXING_FX: 0,
+        LegParameters.AMORT_ES_FLUJO: True,
+        LegParameters.ES_ACT360: True,
+        LegParameters.VALOR_SPREAD: 0.0,
+        LegParameters.VALOR_GEARING: 1.0,
+    })
+
+
+def _start_end(cal, fecha_curse, lag_inicio: int, plazo):
+    """
+    Retorna las fechas de inicio y final de una pata que comienza `lag_inicio` días hábiles después de
+    `fecha_curse` (según `cal`) y que tiene plazo `plazo`.
+    """
+    fecha_inicio = cal.shift(fecha_curse, lag_inicio)
+    return fecha_inicio, fecha_inicio.add_months(plazo.get_months() + 12 * plazo.get_years())
+
+
+class _BulletTemplate(LegTemplate):
+    """
+    Base de los templates de patas bullet. Lee una sola vez los valores por defecto comunes a todas las patas.
+    """
+    def __init__(self, nombre: str, default: Mapping[LegParameters, Any]):
         LegTemplate.__init__(self, nombre, default)
-        self.nombre = nombre
-        self.default = default
+        self._cal = default[LegParameters.CALENDARIO_PAGO]
+        self._lag_inicio = default[LegParameters.LAG_INICIO]
+        self._bus_adj = default[LegParameters.BUS_ADJ_RULE]
+        self._periodicidad = default[LegParameters.PERIODICIDAD_PAGO]
+        self._stub = default[LegParameters.STUB_PERIOD_PAGO]
+        self._lag_pago = default[LegParameters.LAG_PAGO]
+        self._amort_es_flujo = default[LegParameters.AMORT_ES_FLUJO]
+        self._start_end_iso = lru_cache(maxsize=_MAX_CACHED_START_END)(self._compute_start_end_iso)
 
-    def build_leg(self, other: Dict[LegParameters, Any]) -> qcf.Leg:
-        """
-        Construye la pata fija con los valores de `other` y los valores `default`.
+    def _compute_start_end_iso(self, fecha_curse: str, meses: int) -> tuple[str, str]:
+        # Se guardan los códigos ISO y no los `qcf.QCDate`, que son mutables.
+        fecha_inicio = self._cal.shift(qcw.Fecha(fecha=fecha_curse).as_qcf(), self._lag_inicio)
+        return fecha_inicio.iso_code(), fecha_inicio.add_months(meses).iso_code()
 
-        El Dict `other` debe contener las siguientes llaves:
+    @abstractmethod
+    def _build_leg(self, other: Dict[LegParameters, Any], fecha_inicio, fecha_final) -> qcf.Leg:
+        """
+        Construye la pata con los valores de `other`, los valores `default` y las fechas de inicio y final dadas.
+        """
+        pass
 
-        - FECHA_CURSE
-        - REC_PAY
-        - PLAZO
-        - TIPO_TASA
-        - VALOR_TASA
-        - NOCIONAL (en UF)
+    def build_leg(self, other: Dict[LegParameters, Any]) -> qcf.Leg:
+        """
+        Construye la pata con los valores de `other` y los valores `default`. Las llaves que debe contener `other`
+        se indican en `_build_leg` de cada template.
         """
-        cal = self.default[LegParameters.CALENDARIO_PAGO]
-        fecha_inicio = cal.shift(
+        fecha_inicio, fecha_final = _start_end(
+            self._cal,
             other[LegParameters.FECHA_CURSE],
-            self.default[LegParameters.LAG_INICIO]
+            self._lag_inicio,
+            other[LegParameters.PLAZO],
         )
-        total_months = other[LegParameters.PLAZO].get_months()
-        total_months += 12 * other[LegParameters.PLAZO].get_years()
-        fecha_final = fecha_inicio.add_months(total_months)
+        return self._build_leg(other, fecha_inicio, fecha_final)
 
-        tasa_cupon = self.default[LegParameters.TIPO_TASA].as_qcf_with_value(
-            other[LegParameters.VALOR_TASA]
-        )
-
-        return qcf.LegFactory.build_bullet_fixed_rate_leg_2(
-            other[LegParameters.REC_PAY],
-            fecha_inicio,
-            fecha_final,
-            self.default[LegParameters.BUS_ADJ_RULE],
-            self.default[LegParameters.PERIODICIDAD_PAGO],
-            self.default[LegParameters.STUB_PERIOD_PAGO],
-            cal,
-            self.default[LegParameters.LAG_PAGO],
-            other[LegParameters.NOCIONAL],
-            self.default[LegParameters.AMORT_ES_FLUJO],
-            tasa_cupon,
-            self.default[LegParameters.MONEDA_NOCIONAL],
-            self.default[LegParameters.ES_BONO],
+    def build_leg_cached(self, other: Dict[LegParameters, Any]) -> qcf.Leg:
+        """
+        Igual que `build_leg`, pero memoiza (LRU, hasta `_MAX_CACHED_START_END` entradas) las fechas de inicio y
+        final por fecha de curse y plazo. La pata se construye en cada llamada, por lo que se puede modificar.
+        """
+        plazo = other[LegParameters.PLAZO]
+        inicio, final = self._start_end_iso(
+            other[LegParameters.FECHA_CURSE].iso_code(),
+            plazo.get_months() + 12 * plazo.get_years(),
         )
+        return self._build_leg(other, qcw.Fecha(fecha=inicio).as_qcf(), qcw.Fecha(fecha=final).as_qcf())
 
 
-class Fix6MCLPCLP(LegTemplate):
-    def __init__(
-        self,
-        nombre='Fix6MCLPCLP',
-        default={
-            LegParameters.LAG_INICIO: 2,
-            LegParameters.BUS_ADJ_RULE: qcf.BusyAdjRules.MODFOLLOW,
-            LegParameters.PERIODICIDAD_PAGO: qcf.Tenor('6M'),
-            LegParameters.LAG_PAGO: 0,
-            LegParameters.STUB_PERIOD_PAGO: qcf.StubPeriod.SHORTFRONT,
-            LegParameters.CALENDARIO_PAGO: cals['SCL'],
-            LegParameters.MONEDA_NOCIONAL: qcf.QCCLP(),
-            LegParameters.MONEDA_PAGO: qcf.QCCLP(),
-            LegParameters.INDICE_FX: '1CLP',
-            LegParameters.LAG_FIXING_FX: 0,
-            LegParameters.AMORT_ES_FLUJO: True,
-            LegParameters.TIPO_TASA: qcw.TypeOfRate.LINACT360,
-            LegParameters.ES_BONO: False,
-        }
-    ):
-        LegTemplate.__init__(self, nombre, default)
-        self.nombre = nombre
-        self.default = default
+class _FixedRateTemplate(_BulletTemplate):
+    """
+    Template de pata fija bullet. Las subclases sólo definen su nombre y sus valores por defecto.
+    """
+    def __init__(self, nombre: str, default: Mapping[LegParameters, Any]):
+        _BulletTemplate.__init__(self, nombre, default)
+        self._tipo_tasa = default[LegParameters.TIPO_TASA]
+        self._moneda_nocional = default[LegParameters.MONEDA_NOCIONAL]
+        self._es_bono = default[LegParameters.ES_BONO]
 
-    def build_leg(self, other: Dict[LegParameters, Any]) -> qcf.Leg:
+    def _build_leg(self, other: Dict[LegParameters, Any], fecha_inicio, fecha_final) -> qcf.Leg:
         """
         Construye la pata fija con los valores de `other` y los valores `default`.
 
@@ -120,16 +186,7 @@ class Fix6MCLPCLP(LegTemplate):
         - VALOR_TASA
         - NOCIONAL (en UF)
         """
-        cal = self.default[LegParameters.CALENDARIO_PAGO]
-        fecha_inicio = cal.shift(
-            other[LegParameters.FECHA_CURSE],
-            self.default[LegParameters.LAG_INICIO]
-        )
-        total_months = other[LegParameters.PLAZO].get_months()
-        total_months += 12 * other[LegParameters.PLAZO].get_years()
-        fecha_final = fecha_inicio.add_months(total_months)
-
-        tasa_cupon = self.default[LegParameters.TIPO_TASA].as_qcf_with_value(
+        tasa_cupon = self._tipo_tasa.as_qcf_with_value(
             other[LegParameters.VALOR_TASA]
         )
 
@@ -137,45 +194,55 @@ class Fix6MCLPCLP(LegTemplate):
             other[LegParameters.REC_PAY],
             fecha_inicio,
             fecha_final,
-            self.default[LegParameters.BUS_ADJ_RULE],
-            self.default[LegParameters.PERIODICIDAD_PAGO],
-            self.default[LegParameters.STUB_PERIOD_PAGO],
-            cal,
-            self.default[LegParameters.LAG_PAGO],
+            self._bus_adj,
+            self._periodicidad,
+            self._stub,
+            self._cal,
+            self._lag_pago,
             other[LegParameters.NOCIONAL],
-            self.default[LegParameters.AMORT_ES_FLUJO],
+            self._amort_es_flujo,
             tasa_cupon,
-            self.default[LegParameters.MONEDA_NOCIONAL],
-            self.default[LegParameters.ES_BONO],
+            self._moneda_nocional,
+            self._es_bono,
         )
 
 
-class IcpClp6M(LegTemplate):
+class Fix6MCLF(_FixedRateTemplate):
+    def __init__(
+        self,
+        nombre='Fix6MCLF',
+        default: Mapping[LegParameters, Any] | None = None,
+    ):
+        if default is None:
+            default = _fix6mclf_defaults()
+        _FixedRateTemplate.__init__(self, nombre, default)
+
+
+class Fix6MCLPCLP(_FixedRateTemplate):
+    def __init__(
+        self,
+        nombre='Fix6MCLPCLP',
+        default: Mapping[LegParameters, Any] | None = None,
+    ):
+        if default is None:
+            default = _fix6mclpclp_defaults()
+        _FixedRateTemplate.__init__(self, nombre, default)
+
+
+class IcpClp6M(_BulletTemplate):
     def __init__(
         self,
         nombre='IcpClp6M',
-        default={
-            LegParameters.LAG_INICIO: 2,
-            LegParameters.BUS_ADJ_RULE: qcf.BusyAdjRules.MODFOLLOW,
-            LegParameters.PERIODICIDAD_PAGO: qcf.Tenor('6M'),
-            LegParameters.LAG_PAGO: 0,
-            LegParameters.STUB_PERIOD_PAGO: qcf.StubPeriod.SHORTFRONT,
-            LegParameters.CALENDARIO_PAGO: cals['SCL'],
-            LegParameters.MONEDA_NOCIONAL: qcf.QCCLP(),
-            LegParameters.MONEDA_PAGO: qcf.QCCLP(),
-            LegParameters.INDICE_FX: '1CLP',
-            LegParameters.LAG_FIXING_FX: 0,
-            LegParameters.AMORT_ES_FLUJO: True,
-            LegParameters.ES_ACT360: True,
-            LegParameters.VALOR_SPREAD: 0.0,
-            LegParameters.VALOR_GEARING: 1.0,
-        }
+        default: Mapping[LegParameters, Any] | None = None,
     ):
-        LegTemplate.__init__(self, nombre, default)
-        self.nombre = nombre
-        self.default = default
+        if default is None:
+            default = _icpclp6m_defaults()
+        _BulletTemplate.__init__(self, nombre, default)
+        self._spread = default[LegParameters.VALOR_SPREAD]
+        self._gearing = default[LegParameters.VALOR_GEARING]
+        self._es_act360 = default[LegParameters.ES_ACT360]
 
-    def build_leg(self, other: Dict[LegParameters, Any]) -> qcf.Leg:
+    def _build_leg(self, other: Dict[LegParameters, Any], fecha_inicio, fecha_final) -> qcf.Leg:
         """
         Construye la pata ICPCLP con los valores de `other` y los valores `default`.
 
@@ -188,27 +255,18 @@ class IcpClp6M(LegTemplate):
         - VALOR_TASA
         - NOCIONAL (en UF)
         """
-        cal = self.default[LegParameters.CALENDARIO_PAGO]
-        fecha_inicio = cal.shift(
-            other[LegParameters.FECHA_CURSE],
-            self.default[LegParameters.LAG_INICIO]
-        )
-        total_months = other[LegParameters.PLAZO].get_months()
-        total_months += 12 * other[LegParameters.PLAZO].get_years()
-        fecha_final = fecha_inicio.add_months(total_months)
-
         return qcf.LegFactory.build_bullet_icp_clp2_leg(
             other[LegParameters.REC_PAY],
             fecha_inicio,
             fecha_final,
-            self.default[LegParameters.BUS_ADJ_RULE],
-            self.default[LegParameters.PERIODICIDAD_PAGO],
-            self.default[LegParameters.STUB_PERIOD_PAGO],
-            cal,
-            self.default[LegParameters.LAG_PAGO],
+            self._bus_adj,
+            self._periodicidad,
+            self._stub,
+            self._cal,
+            self._lag_pago,
             other[LegParameters.NOCIONAL],
-            self.default[LegParameters.AMORT_ES_FLUJO],
-            self.default[LegParameters.VALOR_SPREAD],
-            self.default[LegParameters.VALOR_GEARING],
-            self.default[LegParameters.ES_ACT360],
+            self._amort_es_flujo,
+            self._spread,
+            self._gearing,
+            self._es_act360,
         )
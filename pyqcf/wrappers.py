@@ -1,18 +1,27 @@
 from enum import Enum, auto
+from functools import lru_cache
+from typing import Annotated, Callable
 from strenum import StrEnum
 from pydantic import (
     NonNegativeInt,
-    BaseModel,
-    field_validator,
-    ConfigDict
+    ConfigDict,
+    PlainSerializer,
 )
-from pydantic.dataclasses import dataclass
+from dataclasses import dataclass
 from datetime import datetime, date
-import pandas as pd
 
 import qcfinancial as qcf
 
 
+def _bind_qcf(table: dict) -> None:
+    """
+    Guarda en el atributo `_qcf` de cada miembro de un `Enum` su valor en `table`. Así `as_qcf` lee un atributo
+    en vez de buscar el miembro en un diccionario (`Enum.__hash__` se implementa en Python).
+    """
+    for member, value in table.items():
+        member._qcf = value
+
+
 class Currency(str, Enum):
     """
     Identifica todas las divisas que se pueden utilizar con `qcfinancial`.
@@ -40,28 +49,7 @@ class Currency(str, Enum):
         """
         Retorna la divisa representada por `self` con el correspondiente objeto `QC_Financial_3`.
         """
-        switcher = {
-            self.AUD: qcf.QCAUD(),
-            self.BRL: qcf.QCBRL(),
-            self.CAD: qcf.QCCAD(),
-            self.CHF: qcf.QCCHF(),
-            self.CLF: qcf.QCCLF(),
-            self.CLP: qcf.QCCLP(),
-            self.CNY: qcf.QCCNY(),
-            self.COP: qcf.QCCOP(),
-            self.DKK: qcf.QCDKK(),
-            self.EUR: qcf.QCEUR(),
-            self.GBP: qcf.QCGBP(),
-            self.HKD: qcf.QCHKD(),
-            self.JPY: qcf.QCJPY(),
-            self.MXN: qcf.QCMXN(),
-            self.NOK: qcf.QCNOK(),
-            self.PEN: qcf.QCPEN(),
-            self.SEK: qcf.QCSEK(),
-            self.USD: qcf.QCUSD(),
-        }
-
-        return switcher[self.value]
+        return self._qcf
 
     def __str__(self):
         return self.as_qcf().get_iso_code()
@@ -70,6 +58,30 @@ class Currency(str, Enum):
         return self.__str__()
 
 
+# Cada divisa se construye una sola vez y se comparte.
+_QCF_CURRENCY: dict[Currency, qcf.QCCurrency] = {
+    Currency.AUD: qcf.QCAUD(),
+    Currency.BRL: qcf.QCBRL(),
+    Currency.CAD: qcf.QCCAD(),
+    Currency.CHF: qcf.QCCHF(),
+    Currency.CLF: qcf.QCCLF(),
+    Currency.CLP: qcf.QCCLP(),
+    Currency.CNY: qcf.QCCNY(),
+    Currency.COP: qcf.QCCOP(),
+    Currency.DKK: qcf.QCDKK(),
+    Currency.EUR: qcf.QCEUR(),
+    Currency.GBP: qcf.QCGBP(),
+    Currency.HKD: qcf.QCHKD(),
+    Currency.JPY: qcf.QCJPY(),
+    Currency.MXN: qcf.QCMXN(),
+    Currency.NOK: qcf.QCNOK(),
+    Currency.PEN: qcf.QCPEN(),
+    Currency.SEK: qcf.QCSEK(),
+    Currency.USD: qcf.QCUSD(),
+}
+_bind_qcf(_QCF_CURRENCY)
+
+
 class BusAdjRules(str, Enum):
     """
     Representa los distintos algoritmos de ajuste de fecha disponibles en `qcfinancial`.
@@ -99,20 +111,22 @@ class BusAdjRules(str, Enum):
         """
         Retorna la regla de ajuste de fecha representada por `self` con el correspondiente objeto `qc_financial`.
         """
-        switcher = {
-            self.NO: qcf.BusyAdjRules.NO,
-            self.FOLLOW: qcf.BusyAdjRules.FOLLOW,
-            self.MOD_FOLLOW: qcf.BusyAdjRules.MODFOLLOW,
-            self.PREV: qcf.BusyAdjRules.PREVIOUS,
-            self.MOD_PREV: qcf.BusyAdjRules.MODPREVIOUS,
-        }
-
-        return switcher[self]
+        return self._qcf
 
     def __str__(self):
         return str(self.value)
 
 
+_QCF_BUS_ADJ_RULES: dict[BusAdjRules, qcf.BusyAdjRules] = {
+    BusAdjRules.NO: qcf.BusyAdjRules.NO,
+    BusAdjRules.FOLLOW: qcf.BusyAdjRules.FOLLOW,
+    BusAdjRules.MOD_FOLLOW: qcf.BusyAdjRules.MODFOLLOW,
+    BusAdjRules.PREV: qcf.BusyAdjRules.PREVIOUS,
+    BusAdjRules.MOD_PREV: qcf.BusyAdjRules.MODPREVIOUS,
+}
+_bind_qcf(_QCF_BUS_ADJ_RULES)
+
+
 class StubPeriods(str, Enum):
     """
     Representa los distintos ajustes de período irregular disponibles en `qcfinancial`.
@@ -141,28 +155,30 @@ class StubPeriods(str, Enum):
         """
         Retorna la regla de ajuste de período irregular representada por `self` con el correspondiente objeto `QC_Financial_3`.
         """
-        switcher = {
-            self.NO: qcf.StubPeriod.NO,
-            self.CORTO_INICIO: qcf.StubPeriod.SHORTFRONT,
-            self.CORTO_FINAL: qcf.StubPeriod.SHORTBACK,
-            self.LARGO_INICIO: qcf.StubPeriod.LONGFRONT,
-            self.LARGO_FINAL: qcf.StubPeriod.LONGBACK,
-            self.LARGO_INICIO_2: qcf.StubPeriod.LONGFRONT2,
-            self.LARGO_INICIO_3: qcf.StubPeriod.LONGFRONT3,
-            self.LARGO_INICIO_4: qcf.StubPeriod.LONGFRONT4,
-            self.LARGO_INICIO_5: qcf.StubPeriod.LONGFRONT5,
-            self.LARGO_INICIO_6: qcf.StubPeriod.LONGFRONT6,
-            self.LARGO_INICIO_7: qcf.StubPeriod.LONGFRONT7,
-            self.LARGO_INICIO_8: qcf.StubPeriod.LONGFRONT8,
-            self.LARGO_INICIO_9: qcf.StubPeriod.LONGFRONT9,
-            self.LARGO_INICIO_10: qcf.StubPeriod.LONGFRONT10,
-            self.LARGO_INICIO_11: qcf.StubPeriod.LONGFRONT11,
-            self.LARGO_INICIO_12: qcf.StubPeriod.LONGFRONT12,
-            self.LARGO_INICIO_13: qcf.StubPeriod.LONGFRONT13,
-            self.LARGO_INICIO_14: qcf.StubPeriod.LONGFRONT14,
-        }
-
-        return switcher[self.value]
+        return self._qcf
+
+
+_QCF_STUB_PERIODS: dict[StubPeriods, qcf.StubPeriod] = {
+    StubPeriods.NO: qcf.StubPeriod.NO,
+    StubPeriods.CORTO_INICIO: qcf.StubPeriod.SHORTFRONT,
+    StubPeriods.CORTO_FINAL: qcf.StubPeriod.SHORTBACK,
+    StubPeriods.LARGO_INICIO: qcf.StubPeriod.LONGFRONT,
+    StubPeriods.LARGO_FINAL: qcf.StubPeriod.LONGBACK,
+    StubPeriods.LARGO_INICIO_2: qcf.StubPeriod.LONGFRONT2,
+    StubPeriods.LARGO_INICIO_3: qcf.StubPeriod.LONGFRONT3,
+    StubPeriods.LARGO_INICIO_4: qcf.StubPeriod.LONGFRONT4,
+    StubPeriods.LARGO_INICIO_5: qcf.StubPeriod.LONGFRONT5,
+    StubPeriods.LARGO_INICIO_6: qcf.StubPeriod.LONGFRONT6,
+    StubPeriods.LARGO_INICIO_7: qcf.StubPeriod.LONGFRONT7,
+    StubPeriods.LARGO_INICIO_8: qcf.StubPeriod.LONGFRONT8,
+    StubPeriods.LARGO_INICIO_9: qcf.StubPeriod.LONGFRONT9,
+    StubPeriods.LARGO_INICIO_10: qcf.StubPeriod.LONGFRONT10,
+    StubPeriods.LARGO_INICIO_11: qcf.StubPeriod.LONGFRONT11,
+    StubPeriods.LARGO_INICIO_12: qcf.StubPeriod.LONGFRONT12,
+    StubPeriods.LARGO_INICIO_13: qcf.StubPeriod.LONGFRONT13,
+    StubPeriods.LARGO_INICIO_14: qcf.StubPeriod.LONGFRONT14,
+}
+_bind_qcf(_QCF_STUB_PERIODS)
 
 
 class YearFraction(StrEnum):
@@ -180,15 +196,17 @@ class YearFraction(StrEnum):
         """
         Retorna la fracción de año representada por `self` como el correspondiente objeto `QC_Financial_3`.
         """
-        switcher = {
-            YearFraction.ACT30: qcf.QCAct30,
-            YearFraction.ACT360: qcf.QCAct360,
-            YearFraction.ACT365: qcf.QCAct365,
-            YearFraction.YF30360: qcf.QC30360,
-            YearFraction.YF3030: qcf.QC3030,
-        }
+        return self._qcf()
 
-        return switcher[self]()
+
+_QCF_YEAR_FRACTION: dict[YearFraction, type] = {
+    YearFraction.ACT30: qcf.QCAct30,
+    YearFraction.ACT360: qcf.QCAct360,
+    YearFraction.ACT365: qcf.QCAct365,
+    YearFraction.YF30360: qcf.QC30360,
+    YearFraction.YF3030: qcf.QC3030,
+}
+_bind_qcf(_QCF_YEAR_FRACTION)
 
 
 class WealthFactor(Enum):
@@ -204,13 +222,15 @@ class WealthFactor(Enum):
         """
         Retorna el factor de capitalización representado por `self` como el correspondiente objeto `QC_Financial`.
         """
-        switcher = {
-            WealthFactor.COM: qcf.QCCompoundWf,
-            WealthFactor.LIN: qcf.QCLinearWf,
-            WealthFactor.CON: qcf.QCContinousWf,
-        }
+        return self._qcf()
+
 
-        return switcher[self]()
+_QCF_WEALTH_FACTOR: dict[WealthFactor, type] = {
+    WealthFactor.COM: qcf.QCCompoundWf,
+    WealthFactor.LIN: qcf.QCLinearWf,
+    WealthFactor.CON: qcf.QCContinousWf,
+}
+_bind_qcf(_QCF_WEALTH_FACTOR)
 
 
 class TypeOfRate(str, Enum):
@@ -242,49 +262,7 @@ class TypeOfRate(str, Enum):
         """
         Retorna `self` en formato `Qcf.QCInterestRate`. El valor de la tasa es 0.
         """
-        switcher = {
-            self.LINACT360: qcf.QCInterestRate(
-                0.0,
-                YearFraction.ACT360.as_qcf(),
-                WealthFactor.LIN.as_qcf(),
-            ),
-            self.LIN30360: qcf.QCInterestRate(
-                0.0,
-                YearFraction.YF30360.as_qcf(),
-                WealthFactor.LIN.as_qcf(),
-            ),
-            self.LINACT365: qcf.QCInterestRate(
-                0.0,
-                YearFraction.ACT365.as_qcf(),
-                WealthFactor.LIN.as_qcf(),
-            ),
-            self.LINACT30: qcf.QCInterestRate(
-                0.0,
-                YearFraction.ACT30.as_qcf(),
-                WealthFactor.LIN.as_qcf(),
-            ),
-            self.COMACT365: qcf.QCInterestRate(
-                0.0,
-                YearFraction.ACT365.as_qcf(),
-                WealthFactor.COM.as_qcf(),
-            ),
-            self.COMACT360: qcf.QCInterestRate(
-                0.0,
-                YearFraction.ACT360.as_qcf(),
-                WealthFactor.COM.as_qcf(),
-            ),
-            self.COM30360: qcf.QCInterestRate(
-                0.0,
-                YearFraction.YF30360.as_qcf(),
-                WealthFactor.COM.as_qcf(),
-            ),
-            self.CONACT365: qcf.QCInterestRate(
-                0.0,
-                YearFraction.ACT365.as_qcf(),
-                WealthFactor.CON.as_qcf(),
-            ),
-        }
-        return switcher[self.value]
+        return self._qcf()
 
     def as_qcf_with_value(self, rate_value: float):
         """
@@ -299,9 +277,7 @@ class TypeOfRate(str, Enum):
         --------
         `Qcf.QCInterestRate`.
         """
-        result = self.as_qcf()
-        result.set_value(rate_value)
-        return result
+        return self._qcf(rate_value)
 
     def __str__(self):
         return str(self.value)
@@ -310,6 +286,35 @@ class TypeOfRate(str, Enum):
         return self.__str__()
 
 
+def _qcir_factory(
+    year_fraction: YearFraction,
+    wealth_factor: WealthFactor,
+) -> Callable[..., qcf.QCInterestRate]:
+    """
+    Retorna una función que construye un `qcf.QCInterestRate` (de valor 0 si no se especifica) con la fracción de
+    año y el factor de capitalización dados. Ambos objetos se construyen una sola vez y se comparten entre las
+    tasas construidas.
+
+    `qcf.QCInterestRate` es mutable (`set_value`), por eso se construye un objeto nuevo en cada llamada.
+    """
+    yf = year_fraction.as_qcf()
+    wf = wealth_factor.as_qcf()
+    return lambda rate_value=0.0: qcf.QCInterestRate(rate_value, yf, wf)
+
+
+_QCIR_FACTORY: dict[TypeOfRate, Callable[..., qcf.QCInterestRate]] = {
+    TypeOfRate.LINACT360: _qcir_factory(YearFraction.ACT360, WealthFactor.LIN),
+    TypeOfRate.LIN30360: _qcir_factory(YearFraction.YF30360, WealthFactor.LIN),
+    TypeOfRate.LINACT365: _qcir_factory(YearFraction.ACT365, WealthFactor.LIN),
+    TypeOfRate.LINACT30: _qcir_factory(YearFraction.ACT30, WealthFactor.LIN),
+    TypeOfRate.COMACT365: _qcir_factory(YearFraction.ACT365, WealthFactor.COM),
+    TypeOfRate.COMACT360: _qcir_factory(YearFraction.ACT360, WealthFactor.COM),
+    TypeOfRate.COM30360: _qcir_factory(YearFraction.YF30360, WealthFactor.COM),
+    TypeOfRate.CONACT365: _qcir_factory(YearFraction.ACT365, WealthFactor.CON),
+}
+_bind_qcf(_QCIR_FACTORY)
+
+
 class AP(str, Enum):
     """
     Representa un Activo o un Pasivo.
@@ -322,10 +327,10 @@ class AP(str, Enum):
         return str(self.value)
 
     def as_qcf(self):
-        if self.value == "A":
-            return qcf.RecPay.RECEIVE
-        else:
-            return qcf.RecPay.PAY
+        return self._qcf
+
+
+_bind_qcf({AP.A: qcf.RecPay.RECEIVE, AP.P: qcf.RecPay.PAY})
 
 
 class FXRate(StrEnum):
@@ -410,7 +415,8 @@ class FXRate(StrEnum):
         if len(fx_rate) != 6:
             raise ValueError(f"{fx_rate} is not a valid FX Rate")
 
-        values = [str(v) for v in list(cls)]
+        # `_value2member_map_` es el diccionario valor -> miembro que ya mantiene `Enum`.
+        values = cls._value2member_map_
         if fx_rate in values:
             return fx_rate
         if (flipped := f"{fx_rate[3:]}{fx_rate[0:3]}") in values:
@@ -419,22 +425,37 @@ class FXRate(StrEnum):
         raise ValueError(f"{fx_rate} is not recognized")
 
 
-@dataclass
+@lru_cache(maxsize=256)
+def _qcf_tenor(tenor: str) -> qcf.Tenor:
+    return qcf.Tenor(tenor)
+
+
+@dataclass(slots=True, frozen=True)
 class Tenor:
     agnos: NonNegativeInt
     meses: NonNegativeInt
     dias: NonNegativeInt
 
+    def __post_init__(self):
+        # Al construir directamente no pasa por pydantic, se mantiene la restricción de `NonNegativeInt`.
+        if self.agnos < 0 or self.meses < 0 or self.dias < 0:
+            raise ValueError(f"Tenor con componentes negativos: {self.agnos}Y{self.meses}M{self.dias}D")
+
     def as_qcf(self):
-        return qcf.Tenor(f"{self.agnos}Y{self.meses}M{self.dias}D")
+        return _qcf_tenor(f"{self.agnos}Y{self.meses}M{self.dias}D")
 
-    def __hash__(self):
+    def _total_dias(self) -> int:
+        # Largo aproximado en días (meses de 30 días), sólo para ordenar.
         return self.dias + self.meses * 30 + self.agnos * 12 * 30
 
+    def __hash__(self):
+        return hash((self.agnos, self.meses, self.dias))
+
     def __lt__(self, other):
-        return self.__hash__() < other.__hash__()
+        return self._total_dias() < other._total_dias()
 
 
+@lru_cache(maxsize=256)
 def build_tenor_from_str(tenor: str) -> Tenor:
     ten = qcf.Tenor(tenor)
     return Tenor(
@@ -444,51 +465,71 @@ def build_tenor_from_str(tenor: str) -> Tenor:
     )
 
 
-class Fecha(BaseModel):
+@lru_cache(maxsize=8192)
+def _dmy_from_iso(iso_code: str) -> tuple[int, int, int]:
+    qcdate = qcf.build_qcdate_from_string(iso_code)
+    return qcdate.day(), qcdate.month(), qcdate.year()
+
+
+def _qcdate_from_iso(iso_code: str) -> qcf.QCDate:
+    """
+    Convierte un código ISO en `qcf.QCDate`. Se memoiza la lectura del código ISO, pero `qcf.QCDate` es mutable,
+    por lo que cada llamada retorna un objeto nuevo.
+    """
+    return qcf.QCDate(*_dmy_from_iso(iso_code))
+
+
+@dataclass(slots=True)
+class Fecha:
     fecha: str | date | qcf.QCDate
 
-    model_config = ConfigDict(
+    # Configuración que usa pydantic cuando `Fecha` es el tipo de un campo de un modelo.
+    __pydantic_config__ = ConfigDict(
         arbitrary_types_allowed=True,
     )
 
-    @field_validator('fecha')
+    def __post_init__(self):
+        self.valid_iso_format(self.fecha)
+
     @classmethod
     def valid_iso_format(cls, v: str | date | qcf.QCDate) -> str | date | qcf.QCDate:
         if isinstance(v, date) or isinstance(v, qcf.QCDate):
             return v
         try:
-            qcf.build_qcdate_from_string(v)
+            _dmy_from_iso(v)
         except Exception as e:
             raise ValueError(f"No es un formato iso de fecha válido. {str(e)}")
         return v
 
+    # Las conversiones no modifican `self.fecha` y se memoizan por código ISO en las funciones de módulo.
     def as_py_date(self):
         if isinstance(self.fecha, str):
-            return datetime.strptime(self.fecha, "%Y-%m-%d").date()
+            return _py_date_from_iso(self.fecha)
         elif isinstance(self.fecha, qcf.QCDate):
-            self.fecha = self.fecha.iso_code()
-            return self.as_py_date()
+            return qcf_date_to_py_date(self.fecha)
         else:
             return self.fecha
 
     def as_qcf(self):
+        """
+        Retorna la fecha como `qcf.QCDate`. Si `fecha` es `str` o `date` se construye un `qcf.QCDate` nuevo en cada
+        llamada (la lectura del código ISO queda en caché al validar). Si `fecha` ya es `qcf.QCDate` se retorna
+        ese mismo objeto.
+        """
         if isinstance(self.fecha, str):
-            return qcf.build_qcdate_from_string(self.fecha)
+            return _qcdate_from_iso(self.fecha)
         elif isinstance(self.fecha, qcf.QCDate):
             return self.fecha
         else:
-            self.fecha = self.fecha.isoformat()
-            return self.as_qcf()
+            return _qcdate_from_iso(self.fecha.isoformat())
 
     def as_tag(self):
         if isinstance(self.fecha, str):
             return self.fecha.replace("-", "")
         elif isinstance(self.fecha, qcf.QCDate):
-            self.fecha = self.fecha.iso_code()
-            return self.as_tag()
+            return self.fecha.iso_code().replace("-", "")
         else:
-            self.fecha = self.fecha.isoformat()
-            return self.as_tag()
+            return self.fecha.isoformat().replace("-", "")
 
     def iso_format(self):
         return self.as_py_date().isoformat()
@@ -497,24 +538,34 @@ class Fecha(BaseModel):
         return hash(self.fecha)
 
 
+# `Fecha` que al serializarse se reduce a su atributo `fecha`. El serializador queda en el tipo y no
+# es necesario repetir un `field_serializer` en cada modelo que tiene campos de fecha.
+FechaSer = Annotated[Fecha, PlainSerializer(lambda dt: dt.fecha)]
+
+
+@lru_cache(maxsize=8192)
+def _py_date_from_iso(iso_code: str) -> date:
+    return datetime.strptime(iso_code, "%Y-%m-%d").date()
+
+
 def qcf_date_to_py_date(qcf_date: qcf.QCDate) -> date:
     """
     Convierte un objeto `Qcf.Date` en un objeto `datetime.date`.
-    """
-    dd = qcf_date.day()
-    mm = qcf_date.month()
-    yy = qcf_date.year()
 
-    return date(yy, mm, dd)
+    `Qcf.Date` no es hashable, por lo que la conversión se memoiza usando como llave su código ISO.
+    """
+    return _py_date_from_iso(qcf_date.iso_code())
 
 
 def qcf_leg_as_dataframe(pata: qcf.Leg):
     """
     Envuelve los flujos de un objeto qcf.Leg en un pandas.DataFrame.
     """
-    tabla = []
-    for i in range(0, pata.size()):
-        tabla.append(qcf.show(pata.get_cashflow_at(i)))
-    c = list(qcf.get_column_names(pata.get_cashflow_at(0).get_type()))
-    dff = pd.DataFrame(tabla, columns=c)
-    return dff
+    # pandas se importa acá, y no al inicio del módulo, porque es la única función que lo usa.
+    import pandas as pd
+
+    get_cashflow_at = pata.get_cashflow_at
+    show = qcf.show
+    tabla = [show(get_cashflow_at(i)) for i in range(pata.size())]
+    c = list(qcf.get_column_names(get_cashflow_at(0).get_type()))
+    return pd.DataFrame.from_records(tabla, columns=c)
@@ -0,0 +1,311 @@
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+qcf = pytest.importorskip("qcfinancial")
+
+from pyqcf import operations as op
+from pyqcf import wrappers as qcw
+
+
+class _Calendars(dict):
+    # Entrega el mismo calendario (sin feriados) para cualquier nombre que pidan los índices.
+    def __missing__(self, key):
+        calendar = qcf.BusinessCalendar(qcf.QCDate(1, 1, 2020), 20)
+        self[key] = calendar
+        return calendar
+
+
+def _ibor_leg() -> op.IborLegModel:
+    return op.IborLegModel(
+        leg_number=1,
+        leg_generator=op.IborLegGenerator(
+            rp=qcw.AP.A,
+            start_date=qcw.Fecha(fecha="2024-01-15"),
+            end_date=qcw.Fecha(fecha="2026-01-15"),
+            maturity=qcw.Tenor(agnos=2, meses=0, dias=0),
+            bus_adj_rule=qcw.BusAdjRules.MOD_FOLLOW,
+            settlement_periodicity=qcw.Tenor(agnos=0, meses=6, dias=0),
+            settlement_stub_period=qcw.StubPeriods.CORTO_INICIO,
+            settlement_calendar="NEW_YORK",
+            settlement_lag=0,
+            type_of_amortization=op.TypeOfAmortization.BULLET,
+            fixing_periodicity=qcw.Tenor(agnos=0, meses=6, dias=0),
+            fixing_stub_period=qcw.StubPeriods.CORTO_INICIO,
+            fixing_calendar="LONDON",
+            fixing_lag=2,
+            interest_rate_index_name="US0006M",
+            notional_or_custom=op.InitialNotional(initial_notional=1_000_000.0),
+            amort_is_cashflow=False,
+            notional_currency=qcw.Currency.USD,
+            spread=0.0,
+            gearing=1.0,
+        ),
+    )
+
+
+def test_fixings_on_current_cashflow_do_not_leak_between_calls():
+    leg = _ibor_leg()
+    calendars = _Calendars()
+    process_date = qcw.Fecha(fecha="2024-09-02")
+    unfixed = leg.get_current_cashflow(process_date, calendars).get_interest_rate_value()
+
+    first = leg.get_current_cashflow(process_date, calendars)
+    first.set_interest_rate_value(0.05)
+    second = leg.get_current_cashflow(process_date, calendars)
+    second.set_interest_rate_value(0.07)
+
+    assert first.get_interest_rate_value() == pytest.approx(0.05)
+    assert second.get_interest_rate_value() == pytest.approx(0.07)
+    assert leg.get_current_cashflow(process_date, calendars).get_interest_rate_value() == pytest.approx(unfixed)
+
+
+def test_qcf_leg_returns_a_new_leg_on_every_call():
+    leg = _ibor_leg()
+    calendars = _Calendars()
+    unfixed = leg.qcf_leg(calendars).get_cashflow_at(0).get_interest_rate_value()
+
+    leg.qcf_leg(calendars).get_cashflow_at(0).set_interest_rate_value(unfixed + 0.05)
+
+    assert leg.qcf_leg(calendars).get_cashflow_at(0).get_interest_rate_value() == pytest.approx(unfixed)
+
+
+# ----------- Payloads por tipo de pata --------------------------------------
+
+_COMMON_GENERATOR = {
+    "rp": "A",
+    "start_date": {"fecha": "2024-01-15"},
+    "end_date": {"fecha": "2026-01-15"},
+    "maturity": {"agnos": 2, "meses": 0, "dias": 0},
+    "bus_adj_rule": "MOD_FOLLOW",
+    "settlement_calendar": "SCL",
+    "settlement_lag": 0,
+    "type_of_amortization": "BULLET",
+    "notional_or_custom": {"initial_notional": 1_000_000.0},
+    "amort_is_cashflow": False,
+}
+
+_SETTLEMENT_PERIODICITY = {
+    "settlement_periodicity": {"agnos": 0, "meses": 6, "dias": 0},
+    "settlement_stub_period": "CORTO INICIO",
+}
+
+_FIXED_RATE_GENERATOR = {
+    **_COMMON_GENERATOR,
+    "periodicity": {"agnos": 0, "meses": 6, "dias": 0},
+    "stub_period": "CORTO INICIO",
+    "coupon_rate_value": 0.05,
+    "coupon_rate_type": "LIN_ACT/360",
+    "notional_currency": "CLP",
+    "is_bond": False,
+}
+
+_IBOR_GENERATOR = {
+    **_COMMON_GENERATOR,
+    **_SETTLEMENT_PERIODICITY,
+    "fixing_periodicity": {"agnos": 0, "meses": 6, "dias": 0},
+    "fixing_stub_period": "CORTO INICIO",
+    "fixing_calendar": "LONDON",
+    "fixing_lag": 2,
+    "interest_rate_index_name": "US0006M",
+    "notional_currency": "USD",
+    "spread": 0.001,
+    "gearing": 1.0,
+}
+
+_OVERNIGHT_INDEX_GENERATOR = {
+    **_COMMON_GENERATOR,
+    **_SETTLEMENT_PERIODICITY,
+    "fix_adj_rule": "PREV",
+    "fixing_calendar": "SCL",
+    "overnight_index_name": "ICPCLP",
+    "interest_rate": "LIN_ACT/360",
+    "eq_rate_decimal_places": 4,
+    "notional_currency": "CLP",
+    "spread": 0.0,
+    "gearing": 1.0,
+}
+
+_ICP_CLF_GENERATOR = {
+    **_COMMON_GENERATOR,
+    **_SETTLEMENT_PERIODICITY,
+    "overnight_index_name": "ICPCLP",
+    "spread": 0.0,
+    "gearing": 1.0,
+}
+
+_COMPOUNDED_OVERNIGHT_RATE_GENERATOR = {
+    **_COMMON_GENERATOR,
+    **_SETTLEMENT_PERIODICITY,
+    "fixing_calendar": "NEW_YORK",
+    "overnight_rate_name": "SOFRRATE",
+    "notional_currency": "USD",
+    "spread": 0.0,
+    "gearing": 1.0,
+    "interest_rate_type": "LIN_ACT/360",
+    "eq_rate_decimal_places": 8,
+    "lookback": 2,
+    "lockout": 0,
+}
+
+_MULTI_CURRENCY = {
+    "settlement_currency": "CLP",
+    "fx_rate_index_name": "USDOBS",
+    "fx_fixing_lag": 1,
+}
+
+# (tipo de pata, clase esperada, Leg Generator, es multi moneda)
+_LEG_CASES = [
+    (op.TypeOfLeg.FIXED_RATE, op.FixedRateLegModel, _FIXED_RATE_GENERATOR, False),
+    (op.TypeOfLeg.FIXED_RATE_MCCY, op.FixedRateMultiCurrencyLegModel, _FIXED_RATE_GENERATOR, True),
+    (op.TypeOfLeg.IBOR, op.IborLegModel, _IBOR_GENERATOR, False),
+    (op.TypeOfLeg.IBOR_MCCY, op.IborMultiCurrencyLegModel, _IBOR_GENERATOR, True),
+    (op.TypeOfLeg.OVERNIGHT_INDEX, op.OvernightIndexLegModel, _OVERNIGHT_INDEX_GENERATOR, False),
+    (
+        op.TypeOfLeg.OVERNIGHT_INDEX_MCCY,
+        op.OvernightIndexMultiCurrencyLegModel,
+        _OVERNIGHT_INDEX_GENERATOR,
+        True,
+    ),
+    (op.TypeOfLeg.ICP_CLF, op.IcpClfLegModel, _ICP_CLF_GENERATOR, False),
+    (
+        op.TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE,
+        op.CompoundedOvernightRateLegModel,
+        _COMPOUNDED_OVERNIGHT_RATE_GENERATOR,
+        False,
+    ),
+    (
+        op.TypeOfLeg.COMPOUNDED_OVERNIGHT_RATE_MCCY,
+        op.CompoundedOvernightRateMultiCurrencyLegModel,
+        _COMPOUNDED_OVERNIGHT_RATE_GENERATOR,
+        True,
+    ),
+]
+
+_LEG_CASE_IDS = [str(type_of_leg) for type_of_leg, *_ in _LEG_CASES]
+
+_CUSTOM_AMORT = {
+    "type_of_amortization": "CUSTOM",
+    "notional_or_custom": {"custom_notional_amort": [[1_000_000.0, 500_000.0], [500_000.0, 500_000.0]]},
+}
+
+
+def _leg_payload(type_of_leg, generator, multi_currency, **generator_overrides) -> dict:
+    payload = {
+        "type_of_leg": type_of_leg.value,
+        "leg_number": 0,
+        "leg_generator": {**generator, **generator_overrides},
+    }
+    if multi_currency:
+        payload["multi_currency"] = dict(_MULTI_CURRENCY)
+    return payload
+
+
+def _operation_payload(*legs: dict) -> dict:
+    return {
+        "trade_date": {"fecha": "2024-01-11"},
+        "deal_number": "12345",
+        "counterparty_name": "Contraparte",
+        "counterparty_rut": {"rut": 12345678, "dv": "5"},
+        "portfolio": "TRADING",
+        "hedge_accounting": "NO",
+        "product": "SWAP_TASA",
+        "currency_pair": "CLPCLP",
+        "settlement_mechanism": "C",
+        "legs": list(legs),
+    }
+
+
+@pytest.mark.parametrize("type_of_leg, leg_cls, generator, multi_currency", _LEG_CASES, ids=_LEG_CASE_IDS)
+@pytest.mark.parametrize("amortization", [{}, _CUSTOM_AMORT], ids=["bullet", "custom"])
+def test_from_trusted_dict_matches_model_validate(type_of_leg, leg_cls, generator, multi_currency, amortization):
+    operation = op.Operation.model_validate(
+        _operation_payload(_leg_payload(type_of_leg, generator, multi_currency, **amortization))
+    )
+
+    assert op.Operation.from_trusted_dict(operation.custom_dump()) == operation
+
+
+_OPERATION_LEG = TypeAdapter(op.OperationLeg)
+
+
+@pytest.mark.parametrize("type_of_leg, leg_cls, generator, multi_currency", _LEG_CASES, ids=_LEG_CASE_IDS)
+def test_operation_leg_is_chosen_by_type_of_leg(type_of_leg, leg_cls, generator, multi_currency):
+    leg = _OPERATION_LEG.validate_python(_leg_payload(type_of_leg, generator, multi_currency))
+
+    assert type(leg) is leg_cls
+    assert leg.type_of_leg is type_of_leg
+    assert _OPERATION_LEG.validate_python(leg) == leg
+
+
+def test_operation_leg_does_not_fall_back_to_other_leg_types():
+    # Un Leg Generator Ibor con `type_of_leg` de pata fija se rechaza, no se prueba con las demás clases.
+    with pytest.raises(ValidationError):
+        _OPERATION_LEG.validate_python(_leg_payload(op.TypeOfLeg.FIXED_RATE, _IBOR_GENERATOR, False))
+
+
+def test_operation_leg_rejects_unknown_type_of_leg():
+    with pytest.raises(ValidationError):
+        _OPERATION_LEG.validate_python({**_leg_payload(op.TypeOfLeg.IBOR, _IBOR_GENERATOR, False), "type_of_leg": "X"})
+
+
+@pytest.mark.parametrize("type_of_leg, leg_cls, generator, multi_currency", _LEG_CASES, ids=_LEG_CASE_IDS)
+@pytest.mark.parametrize("amortization", [{}, _CUSTOM_AMORT], ids=["bullet", "custom"])
+def test_leg_generator_custom_dump_matches_model_dump(type_of_leg, leg_cls, generator, multi_currency, amortization):
+    leg_gen = _OPERATION_LEG.validate_python(
+        _leg_payload(type_of_leg, generator, multi_currency, **amortization)
+    ).leg_generator
+    expected = leg_gen.model_dump()
+    expected.update(expected.pop("notional_or_custom"))
+
+    assert leg_gen.custom_dump(leg_gen.type_of_amortization) == expected
+
+
+@pytest.mark.parametrize("type_of_leg, leg_cls, generator, multi_currency", _LEG_CASES, ids=_LEG_CASE_IDS)
+def test_leg_custom_dump_flattens_generator_and_multi_currency(type_of_leg, leg_cls, generator, multi_currency):
+    leg = _OPERATION_LEG.validate_python(_leg_payload(type_of_leg, generator, multi_currency))
+    expected = {
+        "type_of_leg": type_of_leg,
+        "leg_number": 0,
+        **leg.leg_generator.custom_dump(leg.leg_generator.type_of_amortization),
+    }
+    if multi_currency:
+        expected.update(leg.multi_currency.model_dump())
+
+    assert leg.custom_dump() == expected
+
+
+# ----------- Rut ------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "rut, dv",
+    [
+        (12345678, "5"),
+        (11111111, "1"),
+        (76086428, "5"),
+        (1000005, "K"),
+        (6, "K"),
+        (1000013, "0"),
+        (0, "0"),
+    ],
+)
+def test_rut_accepts_valid_check_digit(rut, dv):
+    assert str(op.Rut(rut=rut, dv=dv)) == f"{rut}-{dv}"
+
+
+@pytest.mark.parametrize(
+    "rut, dv",
+    [
+        (12345678, "4"),
+        (12345678, "K"),
+        (12345678, "0"),
+        (1000005, "0"),
+        (1000013, "K"),
+        (12345678, "k"),
+        (12345678, "55"),
+        (12345678, ""),
+        (-1, "1"),
+    ],
+)
+def test_rut_rejects_invalid_check_digit(rut, dv):
+    with pytest.raises(ValueError):
+        op.Rut(rut=rut, dv=dv)
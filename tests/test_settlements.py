@@ -0,0 +1,40 @@
+import pytest
+
+settlements = pytest.importorskip("pyqcf.settlements")
+
+
+def _settlement_info(deal_number: str, counterparty_name: str = "Contraparte") -> settlements.SettlementInfo:
+    return settlements.SettlementInfo(
+        deal_number=deal_number,
+        product=None,
+        counterparty_name=counterparty_name,
+        counterparty_rut=None,
+        currency_pair=None,
+        settlement_mechanism=None,
+        legs=[],
+    )
+
+
+def test_settlement_info_is_ordered_by_deal_number():
+    infos = [_settlement_info("300"), _settlement_info("100"), _settlement_info("200")]
+
+    assert [info.deal_number for info in sorted(infos)] == ["100", "200", "300"]
+    assert _settlement_info("100") <= _settlement_info("100") < _settlement_info("200")
+    assert _settlement_info("200") > _settlement_info("100")
+
+
+def test_settlement_info_equality_and_hash_use_only_deal_number():
+    first = _settlement_info("100", counterparty_name="A")
+    second = _settlement_info("100", counterparty_name="B")
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second, _settlement_info("200")}) == 2
+
+
+def test_settlement_info_does_not_compare_with_other_types():
+    info = _settlement_info("100")
+
+    assert info != "100"
+    with pytest.raises(TypeError):
+        info < "100"
@@ -0,0 +1,40 @@
+import pytest
+
+qcf = pytest.importorskip("qcfinancial")
+
+from pyqcf import wrappers as qcw
+
+
+def test_tenor_hash_is_consistent_with_equality():
+    assert qcw.Tenor(agnos=1, meses=6, dias=0) == qcw.Tenor(agnos=1, meses=6, dias=0)
+    assert hash(qcw.Tenor(agnos=1, meses=6, dias=0)) == hash(qcw.Tenor(agnos=1, meses=6, dias=0))
+
+    # Tienen el mismo largo aproximado pero son tenors distintos.
+    one_year = qcw.Tenor(agnos=1, meses=0, dias=0)
+    twelve_months = qcw.Tenor(agnos=0, meses=12, dias=0)
+    assert one_year != twelve_months
+    assert len({one_year, twelve_months, qcw.Tenor(agnos=1, meses=0, dias=0)}) == 2
+
+
+def test_tenor_is_ordered_by_approximate_length():
+    tenors = [
+        qcw.Tenor(agnos=1, meses=0, dias=0),
+        qcw.Tenor(agnos=0, meses=1, dias=0),
+        qcw.Tenor(agnos=0, meses=0, dias=2),
+        qcw.Tenor(agnos=0, meses=6, dias=0),
+    ]
+
+    assert sorted(tenors) == [
+        qcw.Tenor(agnos=0, meses=0, dias=2),
+        qcw.Tenor(agnos=0, meses=1, dias=0),
+        qcw.Tenor(agnos=0, meses=6, dias=0),
+        qcw.Tenor(agnos=1, meses=0, dias=0),
+    ]
+    assert not qcw.Tenor(agnos=1, meses=0, dias=0) < qcw.Tenor(agnos=0, meses=12, dias=0)
+    assert not qcw.Tenor(agnos=0, meses=12, dias=0) < qcw.Tenor(agnos=1, meses=0, dias=0)
+
+
+@pytest.mark.parametrize("agnos, meses, dias", [(-1, 0, 0), (0, -1, 0), (0, 0, -1)])
+def test_tenor_rejects_negative_components(agnos, meses, dias):
+    with pytest.raises(ValueError):
+        qcw.Tenor(agnos=agnos, meses=meses, dias=dias)